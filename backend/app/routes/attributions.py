@@ -68,11 +68,14 @@ def trigger_ingestion(
     chain_client: ChainClient = ChainClient()
     chain_client.connect()
     ingestion: IngestionService = IngestionService(db, chain_client)
-    ing_result: IngestionResult = ingestion.ingest_block_range(
-        start_block,
-        end_block,
-        validator_hotkey,
-    )
+    try:
+        ing_result: IngestionResult = ingestion.ingest_block_range(
+            start_block,
+            end_block,
+            validator_hotkey,
+        )
+    finally:
+        ingestion.close()
 
     engine: AttributionEngine = AttributionEngine(db)
     attr_result = engine.run_attribution(start_block, end_block, validator_hotkey)
@@ -53,6 +53,10 @@ class DatabaseSettings(BaseSettings):
     pool_size: int = Field(default=5)
     pool_timeout: int = Field(default=30)
     pool_recycle: int = Field(default=1800)
+    insert_page_size: int = Field(
+        default=1000,
+        description="Rows per multi-row INSERT ... VALUES when batching executemany.",
+    )
 
     def _use_postgres(self) -> bool:
         return bool((self.database_url or "").strip())
@@ -95,6 +99,7 @@ class ChainSettings(BaseSettings):
     retry_attempts: int = Field(default=3)
     retry_delay: float = Field(default=1.0)
     finality_depth: int = Field(default=6)
+    fetch_workers: int = Field(default=8)
 
 
 class Settings(BaseSettings):
@@ -4,7 +4,7 @@ import logging
 from collections.abc import Generator
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -31,7 +31,11 @@ def get_engine() -> Engine:
                 pool_timeout=settings.database.pool_timeout,
                 pool_recycle=settings.database.pool_recycle,
                 pool_pre_ping=True,
+                insertmanyvalues_page_size=settings.database.insert_page_size,
             )
+            if make_url(url).get_driver_name() == "psycopg2":
+                # Batch executemany UPDATE/DELETE too, not only INSERT.
+                opts["executemany_mode"] = "values_plus_batch"
 
         _engine = create_engine(url, **opts)
 
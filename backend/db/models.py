@@ -245,6 +245,8 @@ class RakebackParticipants(Base):
     created_at: Mapped[str] = mapped_column(nullable=False)
     updated_at: Mapped[str] = mapped_column(nullable=False)
     notes: Mapped[str | None] = mapped_column()
+    primary_wallet: Mapped[str | None] = mapped_column()
+    primary_memo_tag: Mapped[str | None] = mapped_column()
     eligibility_rules = relationship(
         "EligibilityRules",
         back_populates="participant",
@@ -0,0 +1,10 @@
+-- 002_data_gaps_range_index.sql
+-- Composite index for per-validator gap range lookups.
+--
+-- Ingestion looks up a validator's SNAPSHOT gaps that overlap a block range
+-- (validator_hotkey = ? AND gap_type = ? AND block_start <= ? AND block_end >= ?).
+-- With this index the lookup seeks straight to the validator and gap type and
+-- range-scans block_start, instead of intersecting the single-column indexes.
+
+CREATE INDEX IF NOT EXISTS ix_data_gaps_validator_range
+    ON data_gaps (validator_hotkey, gap_type, block_start, block_end);
@@ -0,0 +1,58 @@
+-- 003_participant_primary_tag.sql
+-- Denormalised wallet / memo tag shown for each partner in the UI.
+--
+-- The partner list used to find the tag by parsing every eligibility rule's
+-- JSON config. The service now keeps these columns in step when rules are
+-- added: the first wallet or memo rule (by created_at) with a value sets one
+-- of them, and the other stays NULL.
+
+ALTER TABLE rakeback_participants ADD COLUMN primary_wallet TEXT;
+ALTER TABLE rakeback_participants ADD COLUMN primary_memo_tag TEXT;
+
+-- Backfill from existing rules with the same first-match rule.
+UPDATE rakeback_participants
+SET
+    primary_wallet = (
+        SELECT CASE WHEN r.rule_type = 'wallet' THEN
+            COALESCE(
+                NULLIF(json_extract(r.config, '$.wallet'), ''),
+                NULLIF(json_extract(r.config, '$.addresses[0]'), '')
+            )
+        END
+        FROM eligibility_rules r
+        WHERE r.participant_id = rakeback_participants.id
+          AND (
+                (r.rule_type = 'wallet' AND COALESCE(
+                    NULLIF(json_extract(r.config, '$.wallet'), ''),
+                    NULLIF(json_extract(r.config, '$.addresses[0]'), '')
+                ) IS NOT NULL)
+             OR (r.rule_type = 'memo' AND COALESCE(
+                    NULLIF(json_extract(r.config, '$.memo_string'), ''),
+                    NULLIF(json_extract(r.config, '$.memoString'), '')
+                ) IS NOT NULL)
+          )
+        ORDER BY r.created_at
+        LIMIT 1
+    ),
+    primary_memo_tag = (
+        SELECT CASE WHEN r.rule_type = 'memo' THEN
+            COALESCE(
+                NULLIF(json_extract(r.config, '$.memo_string'), ''),
+                NULLIF(json_extract(r.config, '$.memoString'), '')
+            )
+        END
+        FROM eligibility_rules r
+        WHERE r.participant_id = rakeback_participants.id
+          AND (
+                (r.rule_type = 'wallet' AND COALESCE(
+                    NULLIF(json_extract(r.config, '$.wallet'), ''),
+                    NULLIF(json_extract(r.config, '$.addresses[0]'), '')
+                ) IS NOT NULL)
+             OR (r.rule_type = 'memo' AND COALESCE(
+                    NULLIF(json_extract(r.config, '$.memo_string'), ''),
+                    NULLIF(json_extract(r.config, '$.memoString'), '')
+                ) IS NOT NULL)
+          )
+        ORDER BY r.created_at
+        LIMIT 1
+    );
@@ -1,19 +1,30 @@
 """Shared utilities for the service layer."""
 
 import json
+import os
 from collections.abc import Mapping
 from datetime import UTC, datetime
 from typing import Any
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 JsonDict = dict[str, Any]
 Serializable = Mapping[str, object] | list[Mapping[str, object]]
 
+# json.dumps() builds a new encoder whenever a keyword like ``default`` is
+# passed; reusing one keeps the output identical without that setup cost.
+_JSON_ENCODER: json.JSONEncoder = json.JSONEncoder(default=str)
+
 
 def new_id() -> str:
     return str(uuid4())
 
 
+def new_ids(n: int) -> list[str]:
+    """``n`` random UUID4 strings from a single ``os.urandom`` read."""
+    buf: bytes = os.urandom(16 * n)
+    return [str(UUID(bytes=buf[i : i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+
 def now_iso() -> str:
     return datetime.now(UTC).isoformat()
 
@@ -32,4 +43,4 @@ def load_json(raw: str | None) -> JsonDict | None:
 
 
 def dump_json(obj: Serializable) -> str:
-    return json.dumps(obj, default=str)
+    return _JSON_ENCODER.encode(obj)
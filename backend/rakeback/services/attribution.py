@@ -159,22 +159,26 @@ class AttributionEngine:
         reason: str,
         run_id: str,
     ) -> None:
-        existing: Sequence[DataGaps] = self.session.scalars(
-            select(DataGaps).where(
+        gap: DataGaps | None = self.session.scalars(
+            select(DataGaps)
+            .where(
                 and_(
+                    DataGaps.validator_hotkey == vhk,
+                    DataGaps.gap_type == gap_type.value,
+                    DataGaps.resolution_status == ResolutionStatus.OPEN.value,
                     DataGaps.block_start <= block_end,
                     DataGaps.block_end >= block_start,
-                    DataGaps.gap_type == gap_type.value,
                 )
             )
-        ).all()
-        for gap in existing:
-            if gap.validator_hotkey == vhk and gap.resolution_status == ResolutionStatus.OPEN.value:
-                if block_start < gap.block_start or block_end > gap.block_end:
-                    gap.block_start = min(gap.block_start, block_start)
-                    gap.block_end = max(gap.block_end, block_end)
-                    self.session.flush()
-                return
+            .order_by(DataGaps.block_start)
+            .limit(1)
+        ).first()
+        if gap is not None:
+            if block_start < gap.block_start or block_end > gap.block_end:
+                gap.block_start = min(gap.block_start, block_start)
+                gap.block_end = max(gap.block_end, block_end)
+                self.session.flush()
+            return
 
         gap_record: DataGaps = DataGaps(
             id=new_id(),
@@ -232,6 +236,7 @@ class AttributionEngine:
         skip_existing: bool = True,
         fail_on_incomplete: bool = False,
         dry_run: bool = False,
+        consolidate_gaps: bool = True,
     ) -> AttributionResult:
         run: ProcessingRuns = self._create_run(
             RunType.ATTRIBUTION, validator_hotkey, (start_block, end_block)
@@ -284,7 +289,9 @@ class AttributionEngine:
                 logger.exception("Unexpected error during attribution", block_number=block_num)
                 errors.append(f"Block {block_num}: {e}")
 
-        if not dry_run:
+        # Callers that attribute a range in several runs pass consolidate_gaps=False
+        # and call consolidate_gaps() once at the end instead of once per run.
+        if not dry_run and consolidate_gaps:
             gap_counts: dict[str, int] = self.consolidate_gaps(validator_hotkey)
             total_open_gaps: int = sum(gap_counts.values())
         else:
@@ -1,16 +1,23 @@
 """Export service for generating CSV / JSON reports and managing payments."""
 
 import csv
+import gzip
 import io
-from collections.abc import Sequence
+import os
+import re
+from collections import defaultdict
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from decimal import Decimal
 from pathlib import Path
+from typing import Any
 
 import structlog
-from sqlalchemy import ColumnElement, Select, and_, select
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, Row, Select, and_, func, select, update
+from sqlalchemy.orm import Session, sessionmaker
 
+from config import Settings, get_settings
 from db.enums import (
     CompletenessFlag,
     PaymentStatus,
@@ -18,7 +25,7 @@ from db.enums import (
     RunStatus,
     RunType,
 )
-from db.models import ProcessingRuns, RakebackLedgerEntries
+from db.models import ProcessingRuns, RakebackLedgerEntries, RakebackParticipants
 from rakeback.services._helpers import new_id, now_iso
 from rakeback.services._types import (
     ExportDataDict,
@@ -33,12 +40,117 @@ from rakeback.services.schemas.results import ExportResult as ExportResult
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger(__name__)
 
+# Large write buffer so CSV exports hit the filesystem in a few big writes.
+_WRITE_BUFFER_SIZE: int = 8 * 1024 * 1024
+# Rows fetched per round-trip when streaming ledger entries for export.
+_STREAM_CHUNK_SIZE: int = 10_000
+# gzip level for compressed exports; level 1 is close to raw write speed.
+_GZIP_COMPRESSLEVEL: int = 1
+# Max ids per UPDATE ... WHERE id IN (...) to stay under driver parameter limits.
+_UPDATE_CHUNK_SIZE: int = 1000
+
+# Enum values as stored in the ledger columns, resolved once at import.
+_COMPLETE: str = CompletenessFlag.COMPLETE.value
+_PAID: str = PaymentStatus.PAID.value
+
+# Characters that force a CSV field to be quoted (csv.QUOTE_MINIMAL semantics).
+_CSV_NEEDS_QUOTING = re.compile(r'[",\r\n]')
+# Anything outside this set is replaced when an id becomes part of a file name.
+_FILENAME_UNSAFE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+# Export directories already created by this process; ``mkdir`` is a syscall per
+# path component, so skip it once a directory is known to exist.
+_ensured_dirs: set[Path] = set()
+
+
+def _open_export(path: Path, buffering: int = -1, compress: bool = False) -> io.TextIOWrapper:
+    """Open an export file for writing, creating its directory on first use."""
+    parent: Path = path.parent
+    if parent not in _ensured_dirs:
+        parent.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(parent)
+    try:
+        return _open_text(path, buffering, compress)
+    except FileNotFoundError:
+        # Directory was removed after it was cached; recreate it once.
+        _ensured_dirs.discard(parent)
+        parent.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(parent)
+        return _open_text(path, buffering, compress)
+
+
+def _open_text(path: Path, buffering: int, compress: bool) -> io.TextIOWrapper:
+    if compress:
+        return gzip.open(
+            path, "wt", newline="", encoding="utf-8", compresslevel=_GZIP_COMPRESSLEVEL
+        )
+    return open(path, "w", newline="", encoding="utf-8", buffering=buffering)
+
+
+def _drop_page_cache(path: Path) -> None:
+    """Hint the kernel to evict a finished export from the page cache.
+
+    Large exports are written once and not read back by this process, so
+    keeping them cached only competes with the database for memory. Not
+    available on every platform; failures are ignored.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd: int = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _filename_part(value: str) -> str:
+    """Reduce an id to characters safe in a file name (no separators or dot-dot)."""
+    return _FILENAME_UNSAFE.sub("-", value).strip(".-") or "-"
+
+
+def _csv_escape(value: str) -> str:
+    """Quote a free-text CSV field the way ``csv.writer`` would."""
+    if _CSV_NEEDS_QUOTING.search(value) is None:
+        return value
+    return '"' + value.replace('"', '""') + '"'
+
+
+# Ledger columns read by the CSV export, in output order.
+_CSV_SELECT_COLUMNS = (
+    RakebackLedgerEntries.participant_id,
+    RakebackLedgerEntries.participant_type,
+    RakebackLedgerEntries.validator_hotkey,
+    RakebackLedgerEntries.period_start,
+    RakebackLedgerEntries.period_end,
+    RakebackLedgerEntries.gross_dtao_attributed,
+    RakebackLedgerEntries.gross_tao_converted,
+    RakebackLedgerEntries.rakeback_percentage,
+    RakebackLedgerEntries.tao_owed,
+    RakebackLedgerEntries.payment_status,
+    RakebackLedgerEntries.payment_tx_hash,
+    RakebackLedgerEntries.completeness_flag,
+    RakebackLedgerEntries.block_count,
+    RakebackLedgerEntries.attribution_count,
+    RakebackLedgerEntries.id,
+    # Appended last so existing positional readers of the CSV are unaffected.
+    RakebackParticipants.name,
+)
+
 
 class ExportService:
     """Exports rakeback data to CSV / JSON and manages payment marking."""
 
-    def __init__(self, session: Session, export_dir: str = "exports") -> None:
+    def __init__(self, session: Session, export_dir: str | Path | None = None) -> None:
         self.session: Session = session
+        if export_dir is None:
+            settings: Settings = get_settings()
+            export_dir = settings.export_dir
         self.export_dir: Path = Path(export_dir)
 
     def _create_run(self, period: tuple[date, date] | None = None) -> ProcessingRuns:
@@ -55,14 +167,15 @@ class ExportService:
         self.session.flush()
         return run
 
-    def _get_entries(
-        self,
+    @staticmethod
+    def _entry_conditions(
         period_type: PeriodType | None = None,
         period_start: date | None = None,
         period_end: date | None = None,
         participant_id: str | None = None,
         include_incomplete: bool = True,
-    ) -> list[RakebackLedgerEntries]:
+        participant_ids: Sequence[str] | None = None,
+    ) -> list[ColumnElement[bool]]:
         conditions: list[ColumnElement[bool]] = []
         if period_type:
             conditions.append(RakebackLedgerEntries.period_type == period_type.value)
@@ -72,18 +185,107 @@ class ExportService:
             conditions.append(RakebackLedgerEntries.period_end <= period_end.isoformat())
         if participant_id:
             conditions.append(RakebackLedgerEntries.participant_id == participant_id)
+        if participant_ids:
+            conditions.append(RakebackLedgerEntries.participant_id.in_(participant_ids))
         if not include_incomplete:
-            conditions.append(
-                RakebackLedgerEntries.completeness_flag == CompletenessFlag.COMPLETE.value
-            )
+            conditions.append(RakebackLedgerEntries.completeness_flag == _COMPLETE)
+        return conditions
 
+    def _entries_stmt(
+        self,
+        period_type: PeriodType | None = None,
+        period_start: date | None = None,
+        period_end: date | None = None,
+        participant_id: str | None = None,
+        include_incomplete: bool = True,
+        participant_ids: Sequence[str] | None = None,
+    ) -> Select[tuple[RakebackLedgerEntries]]:
+        conditions: list[ColumnElement[bool]] = self._entry_conditions(
+            period_type,
+            period_start,
+            period_end,
+            participant_id,
+            include_incomplete,
+            participant_ids,
+        )
         stmt: Select[tuple[RakebackLedgerEntries]] = select(RakebackLedgerEntries).order_by(
             RakebackLedgerEntries.period_start.desc()
         )
         if conditions:
             stmt = stmt.where(and_(*conditions))
+        return stmt
+
+    def _get_entries(
+        self,
+        period_type: PeriodType | None = None,
+        period_start: date | None = None,
+        period_end: date | None = None,
+        participant_id: str | None = None,
+        include_incomplete: bool = True,
+    ) -> list[RakebackLedgerEntries]:
+        stmt: Select[tuple[RakebackLedgerEntries]] = self._entries_stmt(
+            period_type, period_start, period_end, participant_id, include_incomplete
+        )
         return list(self.session.scalars(stmt).all())
 
+    def _iter_export_rows(
+        self,
+        period_type: PeriodType | None = None,
+        period_start: date | None = None,
+        period_end: date | None = None,
+        include_incomplete: bool = True,
+        participant_ids: Sequence[str] | None = None,
+        chunk_size: int = _STREAM_CHUNK_SIZE,
+    ) -> Iterator[Sequence[Row[*tuple[Any, ...]]]]:
+        """Yield the CSV export columns as plain rows, ``chunk_size`` at a time."""
+        conditions: list[ColumnElement[bool]] = self._entry_conditions(
+            period_type,
+            period_start,
+            period_end,
+            include_incomplete=include_incomplete,
+            participant_ids=participant_ids,
+        )
+        stmt = (
+            select(*_CSV_SELECT_COLUMNS)
+            .outerjoin(
+                RakebackParticipants,
+                RakebackParticipants.id == RakebackLedgerEntries.participant_id,
+            )
+            .order_by(RakebackLedgerEntries.period_start.desc())
+        )
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        # Column rows bypass the identity map; stream_results keeps the driver from
+        # buffering the full result (server-side cursor on PostgreSQL).
+        with self.session.no_autoflush:
+            result = self.session.execute(
+                stmt.execution_options(stream_results=True, yield_per=chunk_size)
+            )
+            yield from result.partitions()
+
+    def _export_totals(
+        self,
+        period_type: PeriodType,
+        period_start: date,
+        period_end: date,
+        include_incomplete: bool = True,
+        participant_ids: Sequence[str] | None = None,
+    ) -> tuple[Decimal, int]:
+        """Return (total TAO owed, incomplete entry count) for an export in one query."""
+        conditions: list[ColumnElement[bool]] = self._entry_conditions(
+            period_type,
+            period_start,
+            period_end,
+            include_incomplete=include_incomplete,
+            participant_ids=participant_ids,
+        )
+        stmt = select(
+            func.sum(RakebackLedgerEntries.tao_owed),
+            func.count().filter(RakebackLedgerEntries.completeness_flag != _COMPLETE),
+        ).where(and_(*conditions))
+        tao_owed, incomplete = self.session.execute(stmt).one()
+        return Decimal(str(tao_owed or 0)), int(incomplete or 0)
+
     _CSV_COLUMNS = [
         "participant_id",
         "participant_type",
@@ -100,6 +302,7 @@ class ExportService:
         "block_count",
         "attribution_count",
         "entry_id",
+        "participant_name",
     ]
 
     def export_ledger_csv(
@@ -110,94 +313,201 @@ class ExportService:
         output_path: Path | None = None,
         participant_ids: Sequence[str] | None = None,
         include_incomplete: bool = True,
+        compress: bool = False,
     ) -> ExportResult:
         run: ProcessingRuns = self._create_run((period_start, period_end))
-
         if output_path is None:
             filename: str = (
                 f"rakeback_{period_type.value}_{period_start.isoformat()}"
                 f"_{period_end.isoformat()}.csv"
             )
             output_path = self.export_dir / filename
+        if compress and output_path.suffix != ".gz":
+            output_path = output_path.with_suffix(output_path.suffix + ".gz")
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        result: ExportResult = self._write_ledger_csv(
+            run.run_id,
+            run.started_at,
+            period_type,
+            period_start,
+            period_end,
+            output_path,
+            participant_ids=participant_ids,
+            include_incomplete=include_incomplete,
+            compress=compress,
+        )
+        self._complete_run(run, result.row_count)
+        self.session.flush()
+        return result
 
-        entries: list[RakebackLedgerEntries] = self._get_entries(
+    def _complete_run(self, run: ProcessingRuns, row_count: int) -> None:
+        run.records_created = row_count
+        run.status = RunStatus.SUCCESS.value
+        run.completed_at = now_iso()
+
+    def _write_ledger_csv(
+        self,
+        run_id: str,
+        generated_at: str,
+        period_type: PeriodType,
+        period_start: date,
+        period_end: date,
+        output_path: Path,
+        participant_ids: Sequence[str] | None = None,
+        include_incomplete: bool = True,
+        compress: bool = False,
+    ) -> ExportResult:
+        """Write the ledger CSV for one run; only reads from the session."""
+        total_tao: Decimal
+        expected_incomplete: int
+        total_tao, expected_incomplete = self._export_totals(
             period_type,
             period_start,
             period_end,
             include_incomplete=include_incomplete,
+            participant_ids=participant_ids,
         )
-        if participant_ids:
-            ids_set: set[str] = set(participant_ids)
-            entries = [e for e in entries if e.participant_id in ids_set]
 
         warnings: list[str] = []
         complete_count: int = 0
         incomplete_count: int = 0
-        total_tao: Decimal = Decimal(0)
+        complete_flag: str = _COMPLETE
 
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
+        with _open_export(output_path, buffering=_WRITE_BUFFER_SIZE, compress=compress) as f:
             writer = csv.writer(f)
 
             writer.writerow([f"# Rakeback Ledger Export - {period_type.value}"])
-            writer.writerow([f"# Generated: {now_iso()}"])
+            writer.writerow([f"# Generated: {generated_at}"])
             writer.writerow([f"# Period: {period_start} to {period_end}"])
-            writer.writerow([f"# Run ID: {run.run_id}"])
+            writer.writerow([f"# Run ID: {run_id}"])
             writer.writerow([])
 
-            incomplete: list[RakebackLedgerEntries] = [
-                e for e in entries if e.completeness_flag != CompletenessFlag.COMPLETE.value
-            ]
-            if incomplete:
+            if expected_incomplete:
                 writer.writerow(["# WARNING: This export contains incomplete data"])
-                writer.writerow([f"# Incomplete entries: {len(incomplete)}"])
-                warnings.append(f"{len(incomplete)} entries have incomplete data")
+                writer.writerow([f"# Incomplete entries: {expected_incomplete}"])
                 writer.writerow([])
 
             writer.writerow(self._CSV_COLUMNS)
 
-            for entry in entries:
-                writer.writerow(
-                    [
-                        entry.participant_id,
-                        entry.participant_type,
-                        entry.validator_hotkey,
-                        entry.period_start,
-                        entry.period_end,
-                        str(entry.gross_dtao_attributed),
-                        str(entry.gross_tao_converted),
-                        str(entry.rakeback_percentage),
-                        str(entry.tao_owed),
-                        entry.payment_status,
-                        entry.payment_tx_hash or "",
-                        entry.completeness_flag,
-                        entry.block_count,
-                        entry.attribution_count,
-                        entry.id,
-                    ]
-                )
-                total_tao += Decimal(str(entry.tao_owed))
-                if entry.completeness_flag == CompletenessFlag.COMPLETE.value:
-                    complete_count += 1
-                else:
-                    incomplete_count += 1
-
-        run.records_created = len(entries)
-        run.status = RunStatus.SUCCESS.value
-        run.completed_at = now_iso()
-        self.session.flush()
+            for chunk in self._iter_export_rows(
+                period_type,
+                period_start,
+                period_end,
+                include_incomplete=include_incomplete,
+                participant_ids=participant_ids,
+            ):
+                lines: list[str] = []
+                append = lines.append
+                for (
+                    pid,
+                    ptype,
+                    vhk,
+                    p_start,
+                    p_end,
+                    dtao,
+                    tao_converted,
+                    pct,
+                    tao_owed,
+                    pay_status,
+                    tx_hash,
+                    flag,
+                    block_count,
+                    attribution_count,
+                    entry_id,
+                    participant_name,
+                ) in chunk:
+                    append(
+                        f"{_csv_escape(pid)},{ptype},{_csv_escape(vhk)},{p_start},{p_end},"
+                        f"{dtao},{tao_converted},{pct},{tao_owed},{pay_status},"
+                        f"{_csv_escape(tx_hash or '')},{flag},{block_count},{attribution_count},"
+                        f"{entry_id},{_csv_escape(participant_name or '')}\r\n"
+                    )
+                    if flag == complete_flag:
+                        complete_count += 1
+                    else:
+                        incomplete_count += 1
+                f.writelines(lines)
+        _drop_page_cache(output_path)
+
+        if incomplete_count:
+            warnings.append(f"{incomplete_count} entries have incomplete data")
+        if incomplete_count != expected_incomplete:
+            logger.warning(
+                "Incomplete entry count changed during export",
+                header_count=expected_incomplete,
+                written_count=incomplete_count,
+            )
 
+        row_count: int = complete_count + incomplete_count
         return ExportResult(
-            run_id=run.run_id,
+            run_id=run_id,
             output_path=output_path,
-            row_count=len(entries),
+            row_count=row_count,
             complete_entries=complete_count,
             incomplete_entries=incomplete_count,
             total_tao=total_tao,
             warnings=warnings,
         )
 
+    def export_ledger_csv_per_participant(
+        self,
+        period_type: PeriodType,
+        period_start: date,
+        period_end: date,
+        participant_ids: Sequence[str],
+        include_incomplete: bool = True,
+        compress: bool = False,
+        max_workers: int = 8,
+    ) -> list[ExportResult]:
+        """Export one ledger CSV per participant (duplicates ignored), in parallel.
+
+        Each file is written on a worker thread through its own session on this
+        session's engine. Those sessions only read and are never committed, so
+        each file reflects the ledger rows committed when its worker queried
+        them; rows still pending in the caller's transaction are not exported.
+        The ProcessingRuns rows are created and completed in this session, as
+        part of the caller's transaction.
+        """
+        ids: list[str] = list(dict.fromkeys(participant_ids))
+        runs: list[ProcessingRuns] = [self._create_run((period_start, period_end)) for _ in ids]
+        jobs: list[tuple[str, str, Path]] = [
+            (
+                run.run_id,
+                run.started_at,
+                self.export_dir
+                / (
+                    f"rakeback_{period_type.value}_{_filename_part(pid)}"
+                    f"_{period_start.isoformat()}_{period_end.isoformat()}.csv"
+                ),
+            )
+            for pid, run in zip(ids, runs, strict=True)
+        ]
+        factory: sessionmaker[Session] = sessionmaker(bind=self.session.get_bind())
+        export_dir: Path = self.export_dir
+
+        def _write_one(pid: str, job: tuple[str, str, Path]) -> ExportResult:
+            run_id, generated_at, output_path = job
+            with factory() as session:
+                return ExportService(session, export_dir)._write_ledger_csv(
+                    run_id,
+                    generated_at,
+                    period_type,
+                    period_start,
+                    period_end,
+                    output_path,
+                    participant_ids=[pid],
+                    include_incomplete=include_incomplete,
+                    compress=compress,
+                )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results: list[ExportResult] = list(pool.map(_write_one, ids, jobs))
+
+        for run, result in zip(runs, results, strict=True):
+            self._complete_run(run, result.row_count)
+        self.session.flush()
+        return results
+
     def export_audit_trail(
         self,
         ledger_entry_id: str,
@@ -215,10 +525,9 @@ class ExportService:
             )
             output_path = self.export_dir / filename
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
         warnings: list[str] = []
 
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
+        with _open_export(output_path) as f:
             writer = csv.writer(f)
             writer.writerow(["# Audit Trail Export"])
             writer.writerow([f"# Ledger Entry ID: {entry.id}"])
@@ -237,7 +546,7 @@ class ExportService:
             writer.writerow(["Block Count", entry.block_count])
             writer.writerow(["Attribution Count", entry.attribution_count])
 
-        is_complete: bool = entry.completeness_flag == CompletenessFlag.COMPLETE.value
+        is_complete: bool = entry.completeness_flag == _COMPLETE
         return ExportResult(
             run_id="",
             output_path=output_path,
@@ -254,53 +563,90 @@ class ExportService:
         payment_tx_hash: str,
         payment_timestamp: str | None = None,
     ) -> int:
-        ts: str = payment_timestamp or now_iso()
+        ids: list[str] = list(dict.fromkeys(entry_ids))
+        if not ids:
+            return 0
+        updated_at: str = now_iso()
+        ts: str = payment_timestamp or updated_at
         count: int = 0
-        for eid in entry_ids:
-            entry: RakebackLedgerEntries | None = self.session.get(RakebackLedgerEntries, eid)
-            if entry and entry.payment_status != PaymentStatus.PAID.value:
-                entry.payment_status = PaymentStatus.PAID.value
-                entry.payment_tx_hash = payment_tx_hash
-                entry.payment_timestamp = ts
-                entry.updated_at = now_iso()
-                count += 1
-        self.session.flush()
+        for i in range(0, len(ids), _UPDATE_CHUNK_SIZE):
+            stmt = (
+                update(RakebackLedgerEntries)
+                .where(
+                    and_(
+                        RakebackLedgerEntries.id.in_(ids[i : i + _UPDATE_CHUNK_SIZE]),
+                        RakebackLedgerEntries.payment_status != _PAID,
+                    )
+                )
+                .values(
+                    payment_status=_PAID,
+                    payment_tx_hash=payment_tx_hash,
+                    payment_timestamp=ts,
+                    updated_at=updated_at,
+                )
+            )
+            result = self.session.execute(stmt)
+            count += int(result.rowcount)  # type: ignore[attr-defined]
         return count
 
+    def _summary_groups(
+        self, conditions: list[ColumnElement[bool]]
+    ) -> Sequence[Row[*tuple[Any, ...]]]:
+        """Counts and sums per (participant, payment status, completeness) group."""
+        stmt = (
+            select(
+                RakebackLedgerEntries.participant_id,
+                RakebackLedgerEntries.payment_status,
+                RakebackLedgerEntries.completeness_flag,
+                func.count(),
+                func.sum(RakebackLedgerEntries.gross_dtao_attributed),
+                func.sum(RakebackLedgerEntries.gross_tao_converted),
+                func.sum(RakebackLedgerEntries.tao_owed),
+            )
+            .where(and_(*conditions))
+            .group_by(
+                RakebackLedgerEntries.participant_id,
+                RakebackLedgerEntries.payment_status,
+                RakebackLedgerEntries.completeness_flag,
+            )
+        )
+        return self.session.execute(stmt).all()
+
     def generate_summary_report(
         self,
         period_type: PeriodType,
         period_start: date,
         period_end: date,
     ) -> SummaryReportDict:
-        entries: list[RakebackLedgerEntries] = self._get_entries(
+        conditions: list[ColumnElement[bool]] = self._entry_conditions(
             period_type, period_start, period_end
         )
 
-        total_dtao: Decimal = sum(
-            (Decimal(str(e.gross_dtao_attributed)) for e in entries), Decimal(0)
+        entry_count: int = 0
+        total_dtao: Decimal = Decimal(0)
+        total_tao_converted: Decimal = Decimal(0)
+        total_tao_owed: Decimal = Decimal(0)
+        by_status: dict[str, int] = defaultdict(int)
+        by_completeness: dict[str, int] = defaultdict(int)
+        by_participant: dict[str, dict[str, Decimal]] = defaultdict(
+            lambda: {"dtao": Decimal(0), "tao_owed": Decimal(0)}
         )
-        total_tao_converted: Decimal = sum(
-            (Decimal(str(e.gross_tao_converted)) for e in entries), Decimal(0)
-        )
-        total_tao_owed: Decimal = sum((Decimal(str(e.tao_owed)) for e in entries), Decimal(0))
-
-        by_status: dict[str, int] = {}
-        for e in entries:
-            by_status[e.payment_status] = by_status.get(e.payment_status, 0) + 1
-
-        by_completeness: dict[str, int] = {}
-        for e in entries:
-            flag = e.completeness_flag
-            by_completeness[flag] = by_completeness.get(flag, 0) + 1
 
-        by_participant: dict[str, dict[str, Decimal]] = {}
-        for e in entries:
-            pid = e.participant_id
-            if pid not in by_participant:
-                by_participant[pid] = {"dtao": Decimal(0), "tao_owed": Decimal(0)}
-            by_participant[pid]["dtao"] += Decimal(str(e.gross_dtao_attributed))
-            by_participant[pid]["tao_owed"] += Decimal(str(e.tao_owed))
+        # One pass over the grouped rows builds every aggregate.
+        for pid, status, flag, count, dtao_sum, converted_sum, owed_sum in self._summary_groups(
+            conditions
+        ):
+            dtao: Decimal = Decimal(str(dtao_sum or 0))
+            tao_owed: Decimal = Decimal(str(owed_sum or 0))
+            entry_count += count
+            total_dtao += dtao
+            total_tao_converted += Decimal(str(converted_sum or 0))
+            total_tao_owed += tao_owed
+            by_status[status] += count
+            by_completeness[flag] += count
+            participant: dict[str, Decimal] = by_participant[pid]
+            participant["dtao"] += dtao
+            participant["tao_owed"] += tao_owed
 
         return SummaryReportDict(
             period=SummaryPeriod(
@@ -309,13 +655,13 @@ class ExportService:
                 end=period_end.isoformat(),
             ),
             totals=SummaryTotals(
-                entries=len(entries),
+                entries=entry_count,
                 gross_dtao_attributed=str(total_dtao),
                 gross_tao_converted=str(total_tao_converted),
                 total_tao_owed=str(total_tao_owed),
             ),
-            by_payment_status=by_status,
-            by_completeness=by_completeness,
+            by_payment_status=dict(by_status),
+            by_completeness=dict(by_completeness),
             by_participant={
                 k: {"dtao": str(v["dtao"]), "tao_owed": str(v["tao_owed"])}
                 for k, v in by_participant.items()
@@ -1,14 +1,24 @@
 """Ingestion service for fetching and storing chain data."""
 
 import csv
-from collections.abc import Sequence
+import io
+import threading
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from decimal import Decimal
+from functools import cache
+from itertools import compress, islice
 from pathlib import Path
+from typing import Any
 
 import structlog
-from sqlalchemy import ColumnElement, Select, and_, delete, func, select
+from sqlalchemy import ColumnElement, Select, and_, delete, insert, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, joinedload
 
+from config import Settings, get_settings
 from db.enums import (
     CompletenessFlag,
     DataSource,
@@ -19,6 +29,7 @@ from db.enums import (
     RunType,
 )
 from db.models import (
+    Base,
     BlockSnapshots,
     BlockYields,
     ConversionEvents,
@@ -33,20 +44,210 @@ from rakeback.services.chain_client import ChainClient
 from rakeback.services.errors import (
     BlockNotFoundError,
     ChainClientError,
-    CSVImportError,  # noqa: F401 — re-exported for backward compat
+    CSVImportError,
     IngestionError,
 )
+from rakeback.services.schemas.chain import BlockYieldData, DelegationData, ValidatorState
 from rakeback.services.schemas.results import IngestionResult as IngestionResult
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger(__name__)
 
+# Blocks submitted to the fetch pool at a time; bounds results held in memory.
+_FETCH_CHUNK_SIZE: int = 256
+# Max values per IN (...) list to stay under driver parameter limits.
+_IN_CHUNK_SIZE: int = 1000
+# Rows per executemany in _bulk_insert. On PostgreSQL, SQLAlchemy further pages
+# each batch into multi-row INSERT ... VALUES statements of 1000 rows.
+_INSERT_CHUNK_SIZE: int = 10_000
+# NULL marker for COPY ... FROM STDIN; CSV leaves an empty field ambiguous.
+_COPY_NULL: str = "\\N"
+
+BlockFetch = tuple[ValidatorState | None, BlockYieldData | None]
+
+# Enum values as stored in the ingestion tables, resolved once at import.
+_COMPLETE: str = CompletenessFlag.COMPLETE.value
+_CHAIN: str = DataSource.CHAIN.value
+# Flags always present in an ingestion run's completeness summary, even at zero.
+_SUMMARY_FLAGS: tuple[CompletenessFlag, ...] = (
+    CompletenessFlag.COMPLETE,
+    CompletenessFlag.PARTIAL,
+    CompletenessFlag.MISSING,
+)
+# Header columns each override CSV must have; the others are optional.
+_SNAPSHOT_CSV_COLUMNS: tuple[str, ...] = (
+    "block_number",
+    "block_hash",
+    "timestamp",
+    "delegator_address",
+    "delegation_type",
+    "balance_dtao",
+)
+_YIELD_CSV_COLUMNS: tuple[str, ...] = ("block_number", "total_dtao_earned")
+
+
+@cache
+def _delegation_type(raw: str) -> str:
+    """Normalise a chain/CSV delegation type (e.g. ``subnet_dtao``) to its stored value."""
+    return DelegationType(raw.upper()).value
+
+
+def _merge_intervals(intervals: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sort inclusive block intervals and merge any that overlap or touch."""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _copy_buffer(rows: Sequence[dict[str, object]], columns: Sequence[str]) -> io.StringIO:
+    """Serialise insert rows as CSV for PostgreSQL ``COPY ... FROM STDIN``."""
+    buf: io.StringIO = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerows([_COPY_NULL if (v := row[c]) is None else v for c in columns] for row in rows)
+    buf.seek(0)
+    return buf
+
+
+def _csv_columns(reader: Iterator[list[str]], required: Sequence[str]) -> dict[str, int]:
+    """Map each header name to its column index, read once before the rows.
+
+    Raises CSVImportError naming every required column the header lacks.
+    """
+    col: dict[str, int] = {name: i for i, name in enumerate(next(reader, []))}
+    missing: list[str] = [name for name in required if name not in col]
+    if missing:
+        raise CSVImportError(f"CSV is missing required columns: {', '.join(missing)}")
+    return col
+
+
+def _csv_field(row: list[str], index: int | None) -> str:
+    """Value of an optional column; empty when the column or the cell is absent."""
+    return row[index] if index is not None and index < len(row) else ""
+
+
+def _summarize_failures(failures: dict[str, list[int]]) -> list[dict[str, object]]:
+    """Collapse per-block failures into one entry per reason with merged block ranges."""
+    return [
+        {"reason": reason, "ranges": _merge_intervals((b, b) for b in blocks)}
+        for reason, blocks in failures.items()
+    ]
+
+
+def _db_error_detail(exc: SQLAlchemyError) -> str:
+    """The driver's message without the statement and parameters SQLAlchemy appends."""
+    orig: BaseException | None = getattr(exc, "orig", None)
+    return str(orig) if orig is not None else type(exc).__name__
+
+
+@dataclass(slots=True)
+class _BlockRows:
+    """Insert-ready rows for a chunk of ingested blocks."""
+
+    ingested_at: str
+    snapshots: list[dict[str, object]] = field(default_factory=list)
+    delegations: list[dict[str, object]] = field(default_factory=list)
+    yields: list[dict[str, object]] = field(default_factory=list)
+    yield_sources: list[dict[str, object]] = field(default_factory=list)
+
+    def split_by_block(self) -> dict[int, "_BlockRows"]:
+        """Regroup the rows into one ``_BlockRows`` per block (staging order is block order)."""
+        by_block: dict[int, _BlockRows] = {}
+        for name in ("snapshots", "delegations", "yields", "yield_sources"):
+            for row in getattr(self, name):
+                block_number: int = row["block_number"]
+                block_rows: _BlockRows | None = by_block.get(block_number)
+                if block_rows is None:
+                    block_rows = by_block[block_number] = _BlockRows(self.ingested_at)
+                getattr(block_rows, name).append(row)
+        return by_block
+
+
+class _ChainClientPool:
+    """Hands each fetch thread its own ChainClient.
+
+    A substrate connection is a single websocket and is not thread-safe. The
+    first thread reuses the service's client; later threads get new ones.
+    Clients are returned to the pool by :meth:`release` rather than closed, so
+    their connections stay warm for the next ingestion on the same service.
+    """
+
+    def __init__(self, primary: ChainClient, factory: Callable[[], ChainClient]) -> None:
+        self._factory: Callable[[], ChainClient] = factory
+        self._local: threading.local = threading.local()
+        self._lock: threading.Lock = threading.Lock()
+        self._idle: list[ChainClient] = [primary]
+        self._leased: list[ChainClient] = []
+        self._spawned: list[ChainClient] = []
+
+    def get(self) -> ChainClient:
+        client: ChainClient | None = getattr(self._local, "client", None)
+        if client is not None:
+            return client
+        with self._lock:
+            if self._idle:
+                client = self._idle.pop(0)
+            else:
+                client = self._factory()
+                self._spawned.append(client)
+            self._leased.append(client)
+        if not client.is_connected():
+            client.connect()
+        self._local.client = client
+        return client
+
+    def release(self) -> None:
+        """Return every leased client; call once the fetch threads are done."""
+        with self._lock:
+            self._idle.extend(self._leased)
+            self._leased.clear()
+            self._local = threading.local()
+
+    def close(self) -> None:
+        self.release()
+        for client in self._spawned:
+            client.disconnect()
+            self._idle.remove(client)
+        self._spawned.clear()
+
 
 class IngestionService:
     """Ingests chain data (snapshots, yields, conversions) into the database."""
 
-    def __init__(self, session: Session, chain_client: ChainClient | None = None) -> None:
+    def __init__(
+        self,
+        session: Session,
+        chain_client: ChainClient | None = None,
+        fetch_workers: int | None = None,
+        chain_client_factory: Callable[[], ChainClient] | None = None,
+    ) -> None:
         self.session: Session = session
         self.chain_client: ChainClient = chain_client or ChainClient()
+        if fetch_workers is None:
+            settings: Settings = get_settings()
+            fetch_workers = settings.chain.fetch_workers
+        self.fetch_workers: int = max(1, fetch_workers)
+        self._clients: _ChainClientPool = _ChainClientPool(
+            self.chain_client, chain_client_factory or self._clone_chain_client
+        )
+
+    def close(self) -> None:
+        """Disconnect the extra chain clients opened for concurrent fetches.
+
+        The caller's own ``chain_client`` is left connected.
+        """
+        self._clients.close()
+
+    def _clone_chain_client(self) -> ChainClient:
+        primary: ChainClient = self.chain_client
+        return ChainClient(
+            rpc_url=primary.rpc_url,
+            timeout=primary.timeout,
+            retry_attempts=primary.retry_attempts,
+            retry_delay=primary.retry_delay,
+        )
 
     def _create_run(
         self,
@@ -70,150 +271,146 @@ class IngestionService:
         self.session.flush()
         return run
 
-    def _snapshot_exists(self, block_number: int, vhk: str) -> bool:
-        stmt = (
-            select(func.count())
-            .select_from(BlockSnapshots)
-            .where(
-                and_(
-                    BlockSnapshots.block_number == block_number,
-                    BlockSnapshots.validator_hotkey == vhk,
-                )
-            )
-        )
-        return (self.session.scalar(stmt) or 0) > 0
-
-    def _conversion_exists_for_tx(self, tx_hash: str) -> bool:
-        stmt = (
-            select(func.count())
-            .select_from(ConversionEvents)
-            .where(ConversionEvents.transaction_hash == tx_hash)
-        )
-        return (self.session.scalar(stmt) or 0) > 0
-
-    def _create_snapshot(
-        self,
-        block_number: int,
-        vhk: str,
-        block_hash: str,
-        timestamp: str,
-        delegations: list[dict[str, object]],
-        data_source: DataSource,
-        completeness_flag: CompletenessFlag,
-    ) -> BlockSnapshots:
-        total_stake: Decimal = sum(
-            (Decimal(str(d.get("balance_dtao", 0))) for d in delegations),
-            Decimal(0),
-        )
-        snap: BlockSnapshots = BlockSnapshots(
-            block_number=block_number,
-            validator_hotkey=vhk,
-            block_hash=block_hash,
-            timestamp=timestamp,
-            ingestion_timestamp=now_iso(),
-            data_source=data_source.value,
-            completeness_flag=completeness_flag.value,
-            total_stake=total_stake,
-        )
-        for d in delegations:
-            balance: Decimal = Decimal(str(d.get("balance_dtao", 0)))
-            proportion: Decimal = balance / total_stake if total_stake > 0 else Decimal(0)
-            entry: DelegationEntries = DelegationEntries(
-                id=new_id(),
-                block_number=block_number,
-                validator_hotkey=vhk,
-                delegator_address=d["delegator_address"],
-                delegation_type=DelegationType(str(d["delegation_type"]).upper()).value,
-                subnet_id=d.get("subnet_id"),
-                balance_dtao=balance,
-                balance_tao=Decimal(str(d["balance_tao"])) if d.get("balance_tao") else None,
-                proportion=proportion,
-            )
-            snap.delegations.append(entry)
-        self.session.add(snap)
-        self.session.flush()
-        return snap
-
-    def _create_yield(
-        self,
-        block_number: int,
-        vhk: str,
-        total_dtao_earned: Decimal,
-        yield_sources: list[dict[str, object]] | None,
-        data_source: DataSource,
-        completeness_flag: CompletenessFlag,
-    ) -> BlockYields:
-        by: BlockYields = BlockYields(
-            block_number=block_number,
-            validator_hotkey=vhk,
-            total_dtao_earned=total_dtao_earned,
-            data_source=data_source.value,
-            completeness_flag=completeness_flag.value,
-            ingestion_timestamp=now_iso(),
-        )
-        if yield_sources:
-            for src in yield_sources:
-                ys: YieldSources = YieldSources(
-                    id=new_id(),
-                    block_number=block_number,
-                    validator_hotkey=vhk,
-                    subnet_id=src["subnet_id"],
-                    dtao_amount=Decimal(str(src["dtao_amount"])),
-                )
-                by.yield_sources.append(ys)
-        self.session.add(by)
-        self.session.flush()
-        return by
+    def _missing_snapshot_mask(self, start: int, end: int, vhk: str) -> bytearray:
+        """One byte per block in ``start..end``: 1 if it has no snapshot yet, else 0.
 
-    def _delete_snapshot_range(self, start: int, end: int, vhk: str) -> int:
-        stmt = delete(BlockSnapshots).where(
+        A flat mask costs one byte per block, where a set of block numbers
+        costs tens of bytes each; that matters for archival backfills.
+        """
+        mask: bytearray = bytearray(b"\x01") * (end - start + 1)
+        stmt = select(BlockSnapshots.block_number).where(
             and_(
+                BlockSnapshots.validator_hotkey == vhk,
                 BlockSnapshots.block_number >= start,
                 BlockSnapshots.block_number <= end,
-                BlockSnapshots.validator_hotkey == vhk,
             )
         )
-        result = self.session.execute(stmt)
-        self.session.flush()
-        return int(result.rowcount)  # type: ignore[attr-defined]
+        for block_number in self.session.scalars(stmt):
+            mask[block_number - start] = 0
+        return mask
+
+    def _existing_tx_hashes(self, tx_hashes: Sequence[str]) -> set[str]:
+        existing: set[str] = set()
+        for i in range(0, len(tx_hashes), _IN_CHUNK_SIZE):
+            stmt = select(ConversionEvents.transaction_hash).where(
+                ConversionEvents.transaction_hash.in_(tx_hashes[i : i + _IN_CHUNK_SIZE])
+            )
+            existing.update(self.session.scalars(stmt).all())
+        return existing
+
+    def _delete_snapshot_blocks(self, block_numbers: Sequence[int], vhk: str) -> None:
+        for i in range(0, len(block_numbers), _IN_CHUNK_SIZE):
+            chunk: Sequence[int] = block_numbers[i : i + _IN_CHUNK_SIZE]
+            self.session.execute(
+                delete(DelegationEntries).where(
+                    DelegationEntries.validator_hotkey == vhk,
+                    DelegationEntries.block_number.in_(chunk),
+                )
+            )
+            self.session.execute(
+                delete(BlockSnapshots).where(
+                    BlockSnapshots.validator_hotkey == vhk,
+                    BlockSnapshots.block_number.in_(chunk),
+                )
+            )
 
-    def _delete_yield_range(self, start: int, end: int, vhk: str) -> int:
-        stmt = delete(BlockYields).where(
-            and_(
-                BlockYields.block_number >= start,
-                BlockYields.block_number <= end,
-                BlockYields.validator_hotkey == vhk,
+    def _delete_yield_blocks(self, block_numbers: Sequence[int], vhk: str) -> None:
+        for i in range(0, len(block_numbers), _IN_CHUNK_SIZE):
+            chunk: Sequence[int] = block_numbers[i : i + _IN_CHUNK_SIZE]
+            self.session.execute(
+                delete(YieldSources).where(
+                    YieldSources.validator_hotkey == vhk,
+                    YieldSources.block_number.in_(chunk),
+                )
+            )
+            self.session.execute(
+                delete(BlockYields).where(
+                    BlockYields.validator_hotkey == vhk,
+                    BlockYields.block_number.in_(chunk),
+                )
             )
-        )
-        result = self.session.execute(stmt)
-        self.session.flush()
-        return int(result.rowcount)  # type: ignore[attr-defined]
 
-    def _record_gap(self, start: int, end: int, vhk: str, reason: str, run_id: str) -> None:
+    def _bulk_insert(self, model: type[Base], rows: list[dict[str, object]]) -> None:
+        for i in range(0, len(rows), _INSERT_CHUNK_SIZE):
+            self.session.execute(insert(model), rows[i : i + _INSERT_CHUNK_SIZE])
+
+    def _bulk_load(self, model: type[Base], rows: list[dict[str, object]]) -> None:
+        """Load complete rows (every column supplied) as fast as the backend allows.
+
+        On PostgreSQL this streams the rows through ``COPY ... FROM STDIN`` on
+        the session's own connection, so it shares the surrounding transaction.
+        Other backends fall back to :meth:`_bulk_insert`.
+        """
+        if not rows:
+            return
+        if self.session.get_bind().dialect.name != "postgresql":
+            self._bulk_insert(model, rows)
+            return
+        columns: list[str] = list(rows[0])
+        sql: str = (
+            f"COPY {model.__tablename__} ({', '.join(columns)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')"
+        )
+        cursor: Any = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(sql, _copy_buffer(rows, columns))
+        finally:
+            cursor.close()
+
+    def _record_gaps(
+        self, gaps: Sequence[tuple[int, int]], vhk: str, reason: str, run_id: str
+    ) -> None:
+        """Record snapshot gaps in one batch, merged into compact ranges.
+
+        Gaps already covered by a recorded gap are dropped; a gap touching an
+        open recorded gap (e.g. across consecutive runs) extends that row
+        instead of adding a new one.
+        """
+        merged: list[tuple[int, int]] = _merge_intervals(gaps)
+        if not merged:
+            return
         existing: Sequence[DataGaps] = self.session.scalars(
             select(DataGaps).where(
                 and_(
-                    DataGaps.block_start <= end,
-                    DataGaps.block_end >= start,
                     DataGaps.gap_type == GapType.SNAPSHOT.value,
+                    DataGaps.validator_hotkey == vhk,
+                    DataGaps.block_start <= merged[-1][1] + 1,
+                    DataGaps.block_end >= merged[0][0] - 1,
                 )
             )
         ).all()
-        for g in existing:
-            if g.validator_hotkey == vhk and g.block_start <= start and g.block_end >= end:
-                return
-        gap: DataGaps = DataGaps(
-            id=new_id(),
-            gap_type=GapType.SNAPSHOT.value,
-            block_start=start,
-            block_end=end,
-            reason=reason,
-            validator_hotkey=vhk,
-            resolution_status=ResolutionStatus.OPEN.value,
-            created_at=now_iso(),
-            detected_by_run_id=run_id,
-        )
-        self.session.add(gap)
+        open_status: str = ResolutionStatus.OPEN.value
+        created_at: str = now_iso()
+        rows: list[dict[str, object]] = []
+        for start, end in merged:
+            if any(g.block_start <= start and g.block_end >= end for g in existing):
+                continue
+            touching: list[DataGaps] = [
+                g
+                for g in existing
+                if g.resolution_status == open_status
+                and g.block_start <= end + 1
+                and g.block_end >= start - 1
+            ]
+            if touching:
+                gap: DataGaps = min(touching, key=lambda g: g.block_start)
+                gap.block_start = min(gap.block_start, start)
+                gap.block_end = max(gap.block_end, end)
+                continue
+            rows.append(
+                {
+                    "id": new_id(),
+                    "gap_type": GapType.SNAPSHOT.value,
+                    "block_start": start,
+                    "block_end": end,
+                    "reason": reason,
+                    "validator_hotkey": vhk,
+                    "resolution_status": open_status,
+                    "created_at": created_at,
+                    "detected_by_run_id": run_id,
+                }
+            )
+        self._bulk_insert(DataGaps, rows)
         self.session.flush()
 
     def ingest_block_range(
@@ -230,84 +427,125 @@ class IngestionService:
             (start_block, end_block),
         )
 
-        if not self.chain_client.is_connected():
-            self.chain_client.connect()
-
         blocks_processed: int = 0
         blocks_created: int = 0
-        blocks_skipped: int = 0
         gaps: list[tuple[int, int]] = []
         errors: list[str] = []
-        completeness: dict[str, int] = {
-            CompletenessFlag.COMPLETE.value: 0,
-            CompletenessFlag.PARTIAL.value: 0,
-            CompletenessFlag.MISSING.value: 0,
-        }
+        # Keyed by the enum member: one increment per block, no .value lookups;
+        # the {value: count} summary is built once after the loop.
+        flag_counts: Counter[CompletenessFlag] = Counter()
+        # Failed blocks by reason, for the run's compact error_details.
+        failures: defaultdict[str, list[int]] = defaultdict(list)
         current_gap_start: int | None = None
+        wanted: bytearray = (
+            self._missing_snapshot_mask(start_block, end_block, validator_hotkey)
+            if skip_existing
+            else bytearray(b"\x01") * (end_block - start_block + 1)
+        )
 
-        for block_num in range(start_block, end_block + 1):
-            try:
-                if skip_existing and self._snapshot_exists(block_num, validator_hotkey):
-                    blocks_skipped += 1
-                    continue
+        # Blocks to fetch are drawn lazily from the one-byte-per-block mask, a
+        # chunk at a time, so no per-block int list is ever materialized.
+        blocks_skipped: int = wanted.count(0)
+        pending: Iterator[int] = compress(range(start_block, end_block + 1), wanted)
 
-                result: CompletenessFlag | None = self._ingest_single_block(
-                    block_num,
-                    validator_hotkey,
-                )
-                blocks_processed += 1
-
-                if result:
-                    blocks_created += 1
-                    completeness[result.value] = completeness.get(result.value, 0) + 1
-                    if current_gap_start is not None:
-                        gaps.append((current_gap_start, block_num - 1))
-                        self._record_gap(
-                            current_gap_start,
-                            block_num - 1,
-                            validator_hotkey,
-                            "Block data unavailable",
-                            run.run_id,
+        # RPC fetches run concurrently; rows are staged in block order on this
+        # thread (the session is never shared) and inserted once per chunk.
+        clients: _ChainClientPool = self._clients
+        pool: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.fetch_workers, thread_name_prefix="chain-fetch"
+        )
+
+        def submit_next() -> tuple[list[int], list[Future[BlockFetch]]]:
+            blocks: list[int] = list(islice(pending, _FETCH_CHUNK_SIZE))
+            return blocks, [
+                pool.submit(self._fetch_block, clients, block_num, validator_hotkey)
+                for block_num in blocks
+            ]
+
+        try:
+            chunk: list[int]
+            futures: list[Future[BlockFetch]]
+            chunk, futures = submit_next()
+            while chunk:
+                # Queue the next chunk's fetches before consuming this one, so the
+                # RPCs overlap with staging and inserting the current chunk.
+                next_chunk: list[int]
+                next_futures: list[Future[BlockFetch]]
+                next_chunk, next_futures = submit_next()
+                rows: _BlockRows = _BlockRows(ingested_at=now_iso())
+                staged: dict[int, CompletenessFlag] = {}
+                for block_num, future in zip(chunk, futures, strict=True):
+                    try:
+                        state: ValidatorState | None
+                        yield_data: BlockYieldData | None
+                        state, yield_data = future.result()
+                        result: CompletenessFlag | None = self._stage_block(
+                            block_num, validator_hotkey, state, yield_data, rows
                         )
-                        current_gap_start = None
-                else:
-                    if current_gap_start is None:
-                        current_gap_start = block_num
-                    completeness[CompletenessFlag.MISSING.value] += 1
-
-            except BlockNotFoundError as e:
-                if current_gap_start is None:
-                    current_gap_start = block_num
-                errors.append(f"Block {block_num}: not found")
-                if fail_on_error:
-                    raise IngestionError(f"Block {block_num} not found") from e
-            except ChainClientError as e:
-                errors.append(f"Block {block_num}: {e}")
-                if fail_on_error:
-                    raise IngestionError(f"Chain error at block {block_num}") from e
-            except Exception as e:
-                logger.exception("Unexpected error during ingestion", block_number=block_num)
-                errors.append(f"Block {block_num}: {e}")
-                if fail_on_error:
-                    raise
+                        blocks_processed += 1
+
+                        if result:
+                            staged[block_num] = result
+                            blocks_created += 1
+                            flag_counts[result] += 1
+                            if current_gap_start is not None:
+                                gaps.append((current_gap_start, block_num - 1))
+                                current_gap_start = None
+                        else:
+                            if current_gap_start is None:
+                                current_gap_start = block_num
+                            flag_counts[CompletenessFlag.MISSING] += 1
+
+                    except BlockNotFoundError as e:
+                        if current_gap_start is None:
+                            current_gap_start = block_num
+                        errors.append(f"Block {block_num}: not found")
+                        failures["not found"].append(block_num)
+                        if fail_on_error:
+                            raise IngestionError(f"Block {block_num} not found") from e
+                    except ChainClientError as e:
+                        errors.append(f"Block {block_num}: {e}")
+                        failures[str(e)].append(block_num)
+                        if fail_on_error:
+                            raise IngestionError(f"Chain error at block {block_num}") from e
+                    except Exception as e:
+                        logger.exception(
+                            "Unexpected error during ingestion", block_number=block_num
+                        )
+                        errors.append(f"Block {block_num}: {e}")
+                        failures[str(e)].append(block_num)
+                        if fail_on_error:
+                            raise
+
+                # One bulk insert per table for the whole chunk; if the database
+                # rejects it, find the offending blocks and count them as failed.
+                for block_num, exc in self._insert_chunk_rows(rows, fail_fast=fail_on_error):
+                    reason: str = f"insert failed: {_db_error_detail(exc)}"
+                    errors.append(f"Block {block_num}: {reason}")
+                    failures[reason].append(block_num)
+                    blocks_created -= 1
+                    flag_counts[staged[block_num]] -= 1
+                    if fail_on_error:
+                        raise IngestionError(f"Insert failed at block {block_num}") from exc
+                chunk, futures = next_chunk, next_futures
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            clients.release()
 
         if current_gap_start is not None:
             gaps.append((current_gap_start, end_block))
-            self._record_gap(
-                current_gap_start,
-                end_block,
-                validator_hotkey,
-                "Block data unavailable",
-                run.run_id,
-            )
+        self._record_gaps(gaps, validator_hotkey, "Block data unavailable", run.run_id)
 
         run.records_processed = blocks_processed
         run.records_created = blocks_created
         run.records_skipped = blocks_skipped
+        completeness: dict[str, int] = {
+            flag.value: flag_counts[flag] for flag in (*_SUMMARY_FLAGS, *flag_counts)
+        }
         run.completeness_summary = dump_json(completeness)
         if errors:
             run.status = RunStatus.PARTIAL.value if blocks_created > 0 else RunStatus.FAILED.value
-            run.error_details = dump_json({"errors": errors[:100]})
+            run.error_details = dump_json({"errors": _summarize_failures(failures)})
         else:
             run.status = RunStatus.SUCCESS.value
         run.completed_at = now_iso()
@@ -323,49 +561,114 @@ class IngestionService:
             errors=errors,
         )
 
-    def _ingest_single_block(self, block_number: int, vhk: str) -> CompletenessFlag | None:
-        state = self.chain_client.get_validator_state(block_number, vhk)
+    @staticmethod
+    def _fetch_block(clients: _ChainClientPool, block_number: int, vhk: str) -> BlockFetch:
+        client: ChainClient = clients.get()
+        state: ValidatorState | None = client.get_validator_state(block_number, vhk)
+        if not state or not state.delegations:
+            return None, None
+        return state, client.get_block_yield(block_number, vhk)
+
+    @staticmethod
+    def _stage_block(
+        block_number: int,
+        vhk: str,
+        state: ValidatorState | None,
+        yield_data: BlockYieldData | None,
+        rows: _BlockRows,
+    ) -> CompletenessFlag | None:
         if not state or not state.delegations:
             return None
 
-        delegations: list[dict[str, object]] = [
+        delegations: list[DelegationData] = state.delegations
+        total_stake: Decimal = sum((d.balance_dtao for d in delegations), Decimal(0))
+        rows.snapshots.append(
             {
-                "delegator_address": d.delegator_address,
-                "delegation_type": d.delegation_type,
-                "subnet_id": d.subnet_id,
-                "balance_dtao": d.balance_dtao,
-                "balance_tao": d.balance_tao,
+                "block_number": block_number,
+                "validator_hotkey": vhk,
+                "block_hash": state.block_hash,
+                "timestamp": state.timestamp.isoformat(),
+                "ingestion_timestamp": rows.ingested_at,
+                "data_source": _CHAIN,
+                "completeness_flag": _COMPLETE,
+                "total_stake": total_stake,
             }
-            for d in state.delegations
-        ]
-
-        self._create_snapshot(
-            block_number=block_number,
-            vhk=vhk,
-            block_hash=state.block_hash,
-            timestamp=state.timestamp.isoformat(),
-            delegations=delegations,
-            data_source=DataSource.CHAIN,
-            completeness_flag=CompletenessFlag.COMPLETE,
         )
+        append = rows.delegations.append
+        for d in delegations:
+            balance: Decimal = d.balance_dtao
+            append(
+                {
+                    "id": new_id(),
+                    "block_number": block_number,
+                    "validator_hotkey": vhk,
+                    "delegator_address": d.delegator_address,
+                    "delegation_type": _delegation_type(d.delegation_type),
+                    "subnet_id": d.subnet_id,
+                    "balance_dtao": balance,
+                    "balance_tao": d.balance_tao or None,
+                    "proportion": balance / total_stake if total_stake > 0 else Decimal(0),
+                }
+            )
 
-        yield_data = self.chain_client.get_block_yield(block_number, vhk)
         if yield_data:
-            sources: list[dict[str, object]] = [
-                {"subnet_id": sid, "dtao_amount": amt}
-                for sid, amt in yield_data.yield_by_subnet.items()
-            ]
-            self._create_yield(
-                block_number=block_number,
-                vhk=vhk,
-                total_dtao_earned=yield_data.total_dtao_earned,
-                yield_sources=sources or None,
-                data_source=DataSource.CHAIN,
-                completeness_flag=CompletenessFlag.COMPLETE,
+            rows.yields.append(
+                {
+                    "block_number": block_number,
+                    "validator_hotkey": vhk,
+                    "total_dtao_earned": yield_data.total_dtao_earned,
+                    "data_source": _CHAIN,
+                    "completeness_flag": _COMPLETE,
+                    "ingestion_timestamp": rows.ingested_at,
+                }
             )
+            for subnet_id, amount in yield_data.yield_by_subnet.items():
+                rows.yield_sources.append(
+                    {
+                        "id": new_id(),
+                        "block_number": block_number,
+                        "validator_hotkey": vhk,
+                        "subnet_id": subnet_id,
+                        "dtao_amount": amount,
+                    }
+                )
 
         return CompletenessFlag.COMPLETE
 
+    def _insert_chunk_rows(
+        self, rows: _BlockRows, fail_fast: bool = False
+    ) -> list[tuple[int, SQLAlchemyError]]:
+        """Insert a chunk's rows, falling back to one savepoint per block on a DB error.
+
+        Returns the blocks whose rows could not be inserted; the other blocks'
+        rows are kept. With ``fail_fast`` the retry stops at the first failure.
+        """
+        try:
+            with self.session.begin_nested():
+                self._insert_block_rows(rows)
+            return []
+        except SQLAlchemyError as e:
+            logger.warning(
+                "Chunk insert failed; retrying block by block", error=_db_error_detail(e)
+            )
+
+        failed: list[tuple[int, SQLAlchemyError]] = []
+        for block_num, block_rows in rows.split_by_block().items():
+            try:
+                with self.session.begin_nested():
+                    self._insert_block_rows(block_rows)
+            except SQLAlchemyError as e:
+                failed.append((block_num, e))
+                if fail_fast:
+                    break
+        return failed
+
+    def _insert_block_rows(self, rows: _BlockRows) -> None:
+        self._bulk_insert(BlockSnapshots, rows.snapshots)
+        self._bulk_insert(DelegationEntries, rows.delegations)
+        self._bulk_insert(BlockYields, rows.yields)
+        self._bulk_insert(YieldSources, rows.yield_sources)
+
     def ingest_conversions(
         self,
         start_block: int,
@@ -389,25 +692,33 @@ class IngestionService:
             conversions = self.chain_client.get_conversion_events(
                 start_block, end_block, validator_hotkey
             )
+            existing_tx: set[str] = self._existing_tx_hashes(
+                [conv.transaction_hash for conv in conversions]
+            )
+            ingested_at: str = now_iso()
+            rows: list[dict[str, object]] = []
             for conv in conversions:
-                if self._conversion_exists_for_tx(conv.transaction_hash):
+                if conv.transaction_hash in existing_tx:
                     events_skipped += 1
                     continue
-                event: ConversionEvents = ConversionEvents(
-                    id=new_id(),
-                    block_number=conv.block_number,
-                    transaction_hash=conv.transaction_hash,
-                    validator_hotkey=conv.validator_hotkey,
-                    dtao_amount=Decimal(str(conv.dtao_amount)),
-                    tao_amount=Decimal(str(conv.tao_amount)),
-                    conversion_rate=Decimal(str(conv.conversion_rate)),
-                    subnet_id=conv.subnet_id,
-                    data_source=DataSource.CHAIN.value,
-                    ingestion_timestamp=now_iso(),
-                    fully_allocated=0,
+                existing_tx.add(conv.transaction_hash)
+                rows.append(
+                    {
+                        "id": new_id(),
+                        "block_number": conv.block_number,
+                        "transaction_hash": conv.transaction_hash,
+                        "validator_hotkey": conv.validator_hotkey,
+                        "dtao_amount": Decimal(str(conv.dtao_amount)),
+                        "tao_amount": Decimal(str(conv.tao_amount)),
+                        "conversion_rate": Decimal(str(conv.conversion_rate)),
+                        "subnet_id": conv.subnet_id,
+                        "data_source": _CHAIN,
+                        "ingestion_timestamp": ingested_at,
+                        "fully_allocated": 0,
+                    }
                 )
-                self.session.add(event)
-                events_created += 1
+            self._bulk_insert(ConversionEvents, rows)
+            events_created = len(rows)
 
             run.records_created = events_created
             run.records_skipped = events_skipped
@@ -444,49 +755,88 @@ class IngestionService:
 
         try:
             with open(csv_path, newline="") as f:
-                reader: csv.DictReader[str] = csv.DictReader(f)
+                reader = csv.reader(f)
+                col: dict[str, int] = _csv_columns(reader, _SNAPSHOT_CSV_COLUMNS)
+                i_block: int = col["block_number"]
+                i_hash: int = col["block_hash"]
+                i_ts: int = col["timestamp"]
+                i_addr: int = col["delegator_address"]
+                i_type: int = col["delegation_type"]
+                i_dtao: int = col["balance_dtao"]
+                i_subnet: int | None = col.get("subnet_id")
+                i_tao: int | None = col.get("balance_tao")
                 for row_num, row in enumerate(reader, start=2):
                     try:
-                        bn: int = int(row["block_number"])
+                        bn: int = int(row[i_block])
                         if bn not in blocks_data:
                             blocks_data[bn] = {
-                                "block_hash": row["block_hash"],
-                                "timestamp": row["timestamp"],
+                                "block_hash": row[i_hash],
+                                "timestamp": row[i_ts],
                                 "delegations": [],
                             }
+                        subnet: str = _csv_field(row, i_subnet)
+                        balance_tao: str = _csv_field(row, i_tao)
                         deleg_list: object = blocks_data[bn]["delegations"]
                         if isinstance(deleg_list, list):
                             deleg_list.append(
                                 {
-                                    "delegator_address": row["delegator_address"],
-                                    "delegation_type": row["delegation_type"],
-                                    "subnet_id": (
-                                        int(row["subnet_id"]) if row.get("subnet_id") else None
-                                    ),
-                                    "balance_dtao": Decimal(row["balance_dtao"]),
-                                    "balance_tao": (
-                                        Decimal(row["balance_tao"])
-                                        if row.get("balance_tao")
-                                        else None
-                                    ),
+                                    "delegator_address": row[i_addr],
+                                    "delegation_type": row[i_type],
+                                    "subnet_id": int(subnet) if subnet else None,
+                                    "balance_dtao": Decimal(row[i_dtao]),
+                                    "balance_tao": Decimal(balance_tao) if balance_tao else None,
                                 }
                             )
-                    except (KeyError, ValueError) as e:
+                    except (IndexError, ValueError, ArithmeticError) as e:
                         errors.append(f"Row {row_num}: {e}")
 
-            for bn, data in sorted(blocks_data.items()):
-                self._delete_snapshot_range(bn, bn, validator_hotkey)
+            # Replace every overridden block with bulk statements rather than a
+            # delete + ORM insert + flush per block.
+            block_numbers: list[int] = sorted(blocks_data)
+            ingested_at: str = now_iso()
+            snapshot_rows: list[dict[str, object]] = []
+            delegation_rows: list[dict[str, object]] = []
+            for bn in block_numbers:
+                data: dict[str, object] = blocks_data[bn]
                 delegs: object = data["delegations"]
-                self._create_snapshot(
-                    block_number=bn,
-                    vhk=validator_hotkey,
-                    block_hash=str(data["block_hash"]),
-                    timestamp=str(data["timestamp"]),
-                    delegations=delegs if isinstance(delegs, list) else [],
-                    data_source=DataSource.CSV_OVERRIDE,
-                    completeness_flag=CompletenessFlag.COMPLETE,
+                rows: list[dict[str, object]] = delegs if isinstance(delegs, list) else []
+                total_stake: Decimal = sum(
+                    (Decimal(str(d["balance_dtao"])) for d in rows), Decimal(0)
                 )
-                blocks_created += 1
+                snapshot_rows.append(
+                    {
+                        "block_number": bn,
+                        "validator_hotkey": validator_hotkey,
+                        "block_hash": str(data["block_hash"]),
+                        "timestamp": str(data["timestamp"]),
+                        "ingestion_timestamp": ingested_at,
+                        "data_source": DataSource.CSV_OVERRIDE.value,
+                        "completeness_flag": _COMPLETE,
+                        "total_stake": total_stake,
+                    }
+                )
+                for d in rows:
+                    balance: Decimal = Decimal(str(d["balance_dtao"]))
+                    delegation_rows.append(
+                        {
+                            "id": new_id(),
+                            "block_number": bn,
+                            "validator_hotkey": validator_hotkey,
+                            "delegator_address": d["delegator_address"],
+                            "delegation_type": _delegation_type(str(d["delegation_type"])),
+                            "subnet_id": d["subnet_id"],
+                            "balance_dtao": balance,
+                            "balance_tao": d["balance_tao"],
+                            "proportion": (
+                                balance / total_stake if total_stake > 0 else Decimal(0)
+                            ),
+                        }
+                    )
+
+            self._delete_snapshot_blocks(block_numbers, validator_hotkey)
+            self._bulk_load(BlockSnapshots, snapshot_rows)
+            self._bulk_load(DelegationEntries, delegation_rows)
+            blocks_created = len(snapshot_rows)
 
             run.records_created = blocks_created
             run.status = RunStatus.SUCCESS.value if not errors else RunStatus.PARTIAL.value
@@ -523,39 +873,66 @@ class IngestionService:
 
         try:
             with open(csv_path, newline="") as f:
-                reader: csv.DictReader[str] = csv.DictReader(f)
+                reader = csv.reader(f)
+                col: dict[str, int] = _csv_columns(reader, _YIELD_CSV_COLUMNS)
+                i_block: int = col["block_number"]
+                i_total: int = col["total_dtao_earned"]
+                i_subnet: int | None = col.get("subnet_id")
+                i_subnet_dtao: int | None = col.get("subnet_dtao")
                 for row_num, row in enumerate(reader, start=2):
                     try:
-                        bn: int = int(row["block_number"])
+                        bn: int = int(row[i_block])
                         if bn not in blocks_data:
                             blocks_data[bn] = {
-                                "total_dtao_earned": Decimal(row["total_dtao_earned"]),
+                                "total_dtao_earned": Decimal(row[i_total]),
                                 "sources": [],
                             }
-                        if row.get("subnet_id") and row.get("subnet_dtao"):
+                        subnet: str = _csv_field(row, i_subnet)
+                        subnet_dtao: str = _csv_field(row, i_subnet_dtao)
+                        if subnet and subnet_dtao:
                             src_list: object = blocks_data[bn]["sources"]
                             if isinstance(src_list, list):
                                 src_list.append(
                                     {
-                                        "subnet_id": int(row["subnet_id"]),
-                                        "dtao_amount": Decimal(row["subnet_dtao"]),
+                                        "subnet_id": int(subnet),
+                                        "dtao_amount": Decimal(subnet_dtao),
                                     }
                                 )
-                    except (KeyError, ValueError) as e:
+                    except (IndexError, ValueError, ArithmeticError) as e:
                         errors.append(f"Row {row_num}: {e}")
 
-            for bn, data in sorted(blocks_data.items()):
-                self._delete_yield_range(bn, bn, validator_hotkey)
-                sources: object = data["sources"]
-                self._create_yield(
-                    block_number=bn,
-                    vhk=validator_hotkey,
-                    total_dtao_earned=Decimal(str(data["total_dtao_earned"])),
-                    yield_sources=sources if isinstance(sources, list) else None,
-                    data_source=DataSource.CSV_OVERRIDE,
-                    completeness_flag=CompletenessFlag.COMPLETE,
+            block_numbers: list[int] = sorted(blocks_data)
+            ingested_at: str = now_iso()
+            yield_rows: list[dict[str, object]] = []
+            source_rows: list[dict[str, object]] = []
+            for bn in block_numbers:
+                data: dict[str, object] = blocks_data[bn]
+                yield_rows.append(
+                    {
+                        "block_number": bn,
+                        "validator_hotkey": validator_hotkey,
+                        "total_dtao_earned": Decimal(str(data["total_dtao_earned"])),
+                        "data_source": DataSource.CSV_OVERRIDE.value,
+                        "completeness_flag": _COMPLETE,
+                        "ingestion_timestamp": ingested_at,
+                    }
                 )
-                yields_created += 1
+                sources: object = data["sources"]
+                for src in sources if isinstance(sources, list) else []:
+                    source_rows.append(
+                        {
+                            "id": new_id(),
+                            "block_number": bn,
+                            "validator_hotkey": validator_hotkey,
+                            "subnet_id": src["subnet_id"],
+                            "dtao_amount": src["dtao_amount"],
+                        }
+                    )
+
+            self._delete_yield_blocks(block_numbers, validator_hotkey)
+            self._bulk_load(BlockYields, yield_rows)
+            self._bulk_load(YieldSources, source_rows)
+            yields_created = len(yield_rows)
 
             run.records_created = yields_created
             run.status = RunStatus.SUCCESS.value if not errors else RunStatus.PARTIAL.value
@@ -1,12 +1,16 @@
 """Partner/participant CRUD service with rule entity sync."""
 
+from collections import defaultdict
+from collections.abc import Callable
 from datetime import date
 from decimal import Decimal
+from functools import lru_cache
 from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import Select, and_, select
-from sqlalchemy.orm import Session
+from sqlalchemy import ScalarResult, Select, and_, insert, select
+from sqlalchemy.orm import Session, defer
+from sqlalchemy.orm.interfaces import LoaderOption
 
 from app.schemas.partners import PartnerCreate, PartnerUpdate, RuleCreate
 from db.enums import (
@@ -35,9 +39,24 @@ def _rule_id() -> str:
     return "rule_" + str(uuid4())[:12]
 
 
+_SLUG_TABLE: dict[int, str] = str.maketrans({" ": "-", "_": "-"})
+
+# The partner list is built from the eligibility rules and the primary tag
+# columns; the engine-facing matching_rules JSON is only loaded if touched.
+_DEFER_MATCHING_RULES: LoaderOption = defer(RakebackParticipants.matching_rules)
+
+# Change-log rows are streamed in batches of this size rather than loaded at once.
+_LOG_YIELD_PER: int = 500
+
+
 def _participant_id_from_name(name: str) -> str:
-    base: str = name.lower().replace(" ", "-").replace("_", "-")
-    return f"partner-{base}"
+    return f"partner-{name.lower().translate(_SLUG_TABLE)}"
+
+
+@lru_cache(maxsize=256)
+def _rate_to_fraction(rate_percent: float) -> Decimal:
+    """UI percentage (e.g. 15.5) -> stored fraction (Decimal("0.155"))."""
+    return Decimal(str(rate_percent / 100))
 
 
 def _load_config(raw: str | dict[str, Any] | None) -> JsonDict:
@@ -87,7 +106,8 @@ def _subnet_filter_rule(config: JsonDict) -> MatchingRuleDict | None:
     return None
 
 
-_RULE_BUILDERS = {
+# Keyed by ApiRuleType, a StrEnum, so raw rule_type strings look up directly.
+_RULE_BUILDERS: dict[str, Callable[[JsonDict], MatchingRuleDict | None]] = {
     ApiRuleType.WALLET: _wallet_rule,
     ApiRuleType.MEMO: _memo_rule,
     ApiRuleType.SUBNET_FILTER: _subnet_filter_rule,
@@ -121,20 +141,43 @@ def eligibility_rules_to_matching_rules(
     rules: list[EligibilityRules],
 ) -> MatchingRulesDict:
     """Convert EligibilityRule rows -> matching_rules dict for the rules engine."""
-    engine_rules: list[MatchingRuleDict] = []
-    for r in rules:
-        config: JsonDict = _load_config(r.config)
-        try:
-            api_type = ApiRuleType(r.rule_type)
-        except ValueError:
-            continue
-        builder = _RULE_BUILDERS.get(api_type)
-        if builder is None:
-            continue
-        rule: MatchingRuleDict | None = builder(config)
-        if rule is not None:
-            engine_rules.append(rule)
-    return MatchingRulesDict(rules=engine_rules)
+    return MatchingRulesDict(rules=[m for r in rules if (m := _to_matching_rule(r)) is not None])
+
+
+def _to_matching_rule(rule: EligibilityRules) -> MatchingRuleDict | None:
+    """Convert one EligibilityRule row; None for unknown types or empty configs."""
+    builder: Callable[[JsonDict], MatchingRuleDict | None] | None = _RULE_BUILDERS.get(
+        rule.rule_type
+    )
+    return builder(_load_config(rule.config)) if builder is not None else None
+
+
+def _append_matching_rules(
+    participant: RakebackParticipants, rules: list[EligibilityRules]
+) -> None:
+    """Append newly added rules to the participant's stored matching_rules."""
+    current: JsonDict = load_json(participant.matching_rules) or {}
+    engine_rules: list[object] = current.get("rules") or []
+    engine_rules.extend(m for r in rules if (m := _to_matching_rule(r)) is not None)
+    participant.matching_rules = dump_json({**current, "rules": engine_rules})
+
+
+def _not_ended(participant: RakebackParticipants, today: str) -> bool:
+    return participant.effective_to is None or participant.effective_to >= today
+
+
+def _set_primary_tag(participant: RakebackParticipants, rule: EligibilityRules) -> None:
+    """Record the partner's UI wallet / memo tag if ``rule`` is the first to supply one."""
+    if participant.primary_wallet or participant.primary_memo_tag:
+        return
+    if rule.rule_type == ApiRuleType.WALLET:
+        cfg: JsonDict = _load_config(rule.config)
+        addrs: list[str] | None = cfg.get("addresses")
+        participant.primary_wallet = cfg.get("wallet") or (
+            addrs[0] if isinstance(addrs, list) and addrs else None
+        )
+    elif rule.rule_type == ApiRuleType.MEMO:
+        participant.primary_memo_tag = _cfg(_load_config(rule.config), "memo_string", "memoString")
 
 
 def _build_eligibility_rule(
@@ -178,12 +221,15 @@ class ParticipantService:
                 )
             )
             .order_by(RakebackParticipants.priority, RakebackParticipants.id)
+            .options(_DEFER_MATCHING_RULES)
         )
         return list(self.session.scalars(stmt).all())
 
     def _get_all_participants(self) -> list[RakebackParticipants]:
-        stmt: Select[tuple[RakebackParticipants]] = select(RakebackParticipants).order_by(
-            RakebackParticipants.id
+        stmt: Select[tuple[RakebackParticipants]] = (
+            select(RakebackParticipants)
+            .order_by(RakebackParticipants.id)
+            .options(_DEFER_MATCHING_RULES)
         )
         return list(self.session.scalars(stmt).all())
 
@@ -195,14 +241,41 @@ class ParticipantService:
         )
         return list(self.session.scalars(stmt).all())
 
+    def _get_rules_by_participant(
+        self, participant_ids: list[str]
+    ) -> defaultdict[str, list[EligibilityRules]]:
+        """Rules for many participants in one query, grouped by participant id."""
+        grouped: defaultdict[str, list[EligibilityRules]] = defaultdict(list)
+        if not participant_ids:
+            return grouped
+        stmt: Select[EligibilityRules] = (
+            select(EligibilityRules)
+            .where(EligibilityRules.participant_id.in_(participant_ids))
+            .order_by(EligibilityRules.created_at)
+        )
+        for rule in self.session.scalars(stmt):
+            grouped[rule.participant_id].append(rule)
+        return grouped
+
     def _participant_exists(self, pid: str) -> bool:
         return self._get_participant(pid) is not None
 
     def list_partners(self, active_only: bool = True) -> list[PartnerUI]:
+        today: date = date.today()
         participants: list[RakebackParticipants] = (
-            self._get_active(date.today()) if active_only else self._get_all_participants()
+            self._get_active(today) if active_only else self._get_all_participants()
+        )
+        rules_by_pid: defaultdict[str, list[EligibilityRules]] = self._get_rules_by_participant(
+            [p.id for p in participants]
         )
-        return [self._participant_to_ui(p) for p in participants]
+        if active_only:
+            # The SQL filter already guarantees every row is active.
+            return [self._participant_to_ui(p, rules_by_pid[p.id], True) for p in participants]
+        today_str: str = today.isoformat()
+        return [
+            self._participant_to_ui(p, rules_by_pid[p.id], _not_ended(p, today_str))
+            for p in participants
+        ]
 
     def get_partner(self, pid: str) -> PartnerUI | None:
         p: RakebackParticipants | None = self._get_participant(pid)
@@ -266,7 +339,7 @@ class ParticipantService:
             partner_type=pt.value,
             priority=priority,
             matching_rules=dump_json({"rules": []}),
-            rakeback_percentage=Decimal(str(rakeback_rate / 100)),
+            rakeback_percentage=_rate_to_fraction(rakeback_rate),
             effective_from=effective.isoformat(),
             effective_to=None,
             payout_address=payout_address or "0x0",
@@ -276,17 +349,15 @@ class ParticipantService:
         )
         self.session.add(participant)
 
-        rule_entities: list[EligibilityRules] = []
-        for r in rules or []:
-            entity: EligibilityRules | None = self._create_rule_entity(
-                participant.id, r, block, created_by
-            )
-            if entity:
-                self.session.add(entity)
-                rule_entities.append(entity)
-
+        rule_entities: list[EligibilityRules] = [
+            entity
+            for r in rules or []
+            if (entity := self._create_rule_entity(participant.id, r, block, created_by))
+        ]
+        self.session.add_all(rule_entities)
+        for entity in rule_entities:
+            _set_primary_tag(participant, entity)
         participant.matching_rules = dump_json(eligibility_rules_to_matching_rules(rule_entities))
-        self.session.flush()
 
         self._log_change(
             action="Created partner",
@@ -296,7 +367,9 @@ class ParticipantService:
             applies_from_block=block,
             user=created_by,
         )
-        return self.get_partner(pid) or PartnerUI()
+        # One flush writes the participant, its rules and the audit entry together.
+        self.session.flush()
+        return self._participant_to_ui(participant, rule_entities)
 
     def update_partner(
         self,
@@ -310,7 +383,7 @@ class ParticipantService:
         if updates.name is not None:
             p.name = updates.name
         if updates.rakeback_rate is not None:
-            p.rakeback_percentage = Decimal(str(updates.rakeback_rate / 100))
+            p.rakeback_percentage = _rate_to_fraction(updates.rakeback_rate)
         if updates.priority is not None:
             p.priority = updates.priority
         if updates.payout_address is not None:
@@ -337,18 +410,63 @@ class ParticipantService:
         if not entity:
             return None
         self.session.add(entity)
-        all_rules: list[EligibilityRules] = self._get_rules(participant_id)
-        all_rules.append(entity)
-        p.matching_rules = dump_json(eligibility_rules_to_matching_rules(all_rules))
+        _set_primary_tag(p, entity)
+        _append_matching_rules(p, [entity])
         p.updated_at = now_iso()
         self.session.flush()
         return self._rule_to_ui(entity)
 
+    def add_rules_bulk(
+        self,
+        participant_id: str,
+        rules: list[RuleCreate],
+        created_by: str = "system",
+    ) -> list[RuleUI] | None:
+        """Add many rules to a participant with one Core INSERT.
+
+        Invalid rules are skipped, as in :meth:`add_rule`. The rows bypass the
+        ORM unit of work, which matters for partners with thousands of wallets.
+        """
+        p: RakebackParticipants | None = self._get_participant(participant_id)
+        if not p:
+            return None
+        entities: list[EligibilityRules] = [
+            entity
+            for r in rules
+            if (entity := self._create_rule_entity(participant_id, r, 0, created_by))
+        ]
+        if not entities:
+            return []
+        self.session.execute(
+            insert(EligibilityRules),
+            [
+                {
+                    "id": e.id,
+                    "participant_id": e.participant_id,
+                    "rule_type": e.rule_type,
+                    "config": e.config,
+                    "applies_from_block": e.applies_from_block,
+                    "created_at": e.created_at,
+                    "created_by": e.created_by,
+                }
+                for e in entities
+            ],
+        )
+        for entity in entities:
+            _set_primary_tag(p, entity)
+        _append_matching_rules(p, entities)
+        p.updated_at = now_iso()
+        self.session.flush()
+        return [self._rule_to_ui(e) for e in entities]
+
     def get_rule_change_log(self, limit: int = 100) -> list[ChangeLogEntry]:
         stmt: Select[tuple[RuleChangeLog]] = (
-            select(RuleChangeLog).order_by(RuleChangeLog.timestamp.desc()).limit(limit)
+            select(RuleChangeLog)
+            .order_by(RuleChangeLog.timestamp.desc())
+            .limit(limit)
+            .execution_options(yield_per=_LOG_YIELD_PER)
         )
-        entries: list[RuleChangeLog] = list(self.session.scalars(stmt).all())
+        entries: ScalarResult[RuleChangeLog] = self.session.scalars(stmt)
         return [
             ChangeLogEntry(
                 timestamp=(e.timestamp or "")[:19].replace("T", " "),
@@ -365,33 +483,17 @@ class ParticipantService:
         self,
         p: RakebackParticipants,
         rules: list[EligibilityRules] | None = None,
+        active: bool | None = None,
     ) -> PartnerUI:
         if rules is None:
             rules = self._get_rules(p.id)
+        if active is None:
+            active = _not_ended(p, date.today().isoformat())
 
         pt_val: str = p.partner_type or PartnerType.NAMED.value
         partner_type_ui: str = _PARTNER_TYPE_DISPLAY.get(pt_val, "Named")
 
-        wallet: str | None = None
-        memo_tag: str | None = None
-        for r in rules:
-            cfg: JsonDict = _load_config(r.config)
-            if r.rule_type == ApiRuleType.WALLET:
-                addrs: list[str] | None = cfg.get("addresses")
-                wallet = cfg.get("wallet") or (
-                    addrs[0] if isinstance(addrs, list) and addrs else None
-                )
-                if wallet:
-                    break
-            elif r.rule_type == ApiRuleType.MEMO:
-                memo_tag = _cfg(cfg, "memo_string", "memoString")
-                if memo_tag:
-                    break
-
-        eff_to: str | None = p.effective_to
-        status: str = (
-            "active" if (eff_to is None or eff_to >= date.today().isoformat()) else "inactive"
-        )
+        status: str = "active" if active else "inactive"
 
         return PartnerUI(
             id=p.id,
@@ -402,8 +504,8 @@ class ParticipantService:
             status=status,
             createdBy="system",
             createdDate=(p.created_at or "")[:10],
-            walletAddress=wallet,
-            memoTag=memo_tag,
+            walletAddress=p.primary_wallet,
+            memoTag=p.primary_memo_tag,
             applyFromDate=p.effective_from,
             payoutAddress=p.payout_address,
             rules=[self._rule_to_ui(r) for r in rules],
@@ -503,4 +605,3 @@ class ParticipantService:
             applies_from_block=applies_from_block,
         )
         self.session.add(entry)
-        self.session.flush()
@@ -3,6 +3,7 @@
 from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import date
+from functools import lru_cache
 
 from sqlalchemy import Select, and_, select
 from sqlalchemy.orm import Session
@@ -13,6 +14,8 @@ from rakeback.services._helpers import JsonDict, load_json
 from rakeback.services._types import ParticipantSnapshot, RulesSnapshot
 from rakeback.services.errors import InvalidRuleError, RulesEngineError  # noqa: F401 — re-exported
 
+_VALID_DTYPES: frozenset[str] = frozenset(dt.value for dt in DelegationType)
+
 
 def _str_list(data: dict[str, object], key: str) -> list[str]:
     raw: object = data.get(key)
@@ -79,7 +82,7 @@ class Rule:
             case _:
                 return False
 
-    def validate(self, valid_dtypes: set[str]) -> list[str]:
+    def validate(self, valid_dtypes: frozenset[str]) -> list[str]:
         match self.type:
             case RuleType.EXACT_ADDRESS:
                 if not self.addresses:
@@ -103,11 +106,150 @@ class Rule:
                 return []
 
 
+@dataclass(frozen=True, slots=True)
+class _CompiledRules:
+    """A participant's rules folded into hashed lookups for the matching hot path.
+
+    Exact-address, subnet and ALL rules collapse into sets and a flag. Each
+    delegation-type rule keeps its own (types, subnets) pair because its
+    subnet filter only applies to its own types.
+    """
+
+    addresses: frozenset[str]
+    subnet_ids: frozenset[int]
+    delegation_types: tuple[tuple[frozenset[str], frozenset[int]], ...]
+    match_all: bool
+
+    @classmethod
+    def from_rules(cls, rules: Sequence[Rule]) -> "_CompiledRules":
+        addresses: set[str] = set()
+        subnet_ids: set[int] = set()
+        delegation_types: list[tuple[frozenset[str], frozenset[int]]] = []
+        match_all: bool = False
+        for rule in rules:
+            match rule.type:
+                case RuleType.EXACT_ADDRESS:
+                    addresses.update(rule.addresses)
+                case RuleType.DELEGATION_TYPE:
+                    delegation_types.append(
+                        (frozenset(rule.delegation_types), frozenset(rule.subnet_ids))
+                    )
+                case RuleType.SUBNET:
+                    subnet_ids.update(rule.subnet_ids)
+                case RuleType.ALL:
+                    match_all = True
+        return cls(frozenset(addresses), frozenset(subnet_ids), tuple(delegation_types), match_all)
+
+    def matches(
+        self,
+        delegator_address: str,
+        delegation_type_value: str,
+        subnet_id: int | None,
+    ) -> bool:
+        if self.match_all or delegator_address in self.addresses:
+            return True
+        if subnet_id is not None and subnet_id in self.subnet_ids:
+            return True
+        return any(
+            delegation_type_value in types and (not subnets or subnet_id in subnets)
+            for types, subnets in self.delegation_types
+        )
+
+    def matches_address(self, address: str) -> bool:
+        return self.match_all or address in self.addresses
+
+
+def _parse_rules(raw: str | None) -> list[Rule]:
+    mr: JsonDict | None = load_json(raw) if isinstance(raw, str) else None
+    if not isinstance(mr, dict):
+        return []
+    raw_rules: object = mr.get("rules")
+    if not isinstance(raw_rules, list):
+        return []
+    parsed: list[Rule | None] = [Rule.from_dict(r) for r in raw_rules if isinstance(r, dict)]
+    return [r for r in parsed if r is not None]
+
+
+@lru_cache(maxsize=1024)
+def _compile_rules(raw: str | None) -> _CompiledRules:
+    # Keyed by the stored matching_rules JSON text, so an edited rule set is a
+    # new key and stale entries simply age out.
+    return _CompiledRules.from_rules(_parse_rules(raw))
+
+
+@dataclass(slots=True)
+class _ParticipantIndex:
+    """Active participants for one date, indexed by what their rules key on.
+
+    Positions refer to ``participants``, which is in priority order, so the
+    lowest matching position is the participant a linear scan would return.
+    Participants with delegation-type or ALL rules cannot be keyed and stay
+    in ``general`` to be checked in order.
+    """
+
+    participants: Sequence[RakebackParticipants]
+    by_address: dict[str, int] = field(default_factory=dict)
+    by_subnet: dict[int, int] = field(default_factory=dict)
+    general: list[tuple[int, _CompiledRules]] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, participants: Sequence[RakebackParticipants]) -> "_ParticipantIndex":
+        index: _ParticipantIndex = cls(participants)
+        for pos, p in enumerate(participants):
+            compiled: _CompiledRules = _compile_rules(p.matching_rules)
+            for address in compiled.addresses:
+                index.by_address.setdefault(address, pos)
+            for subnet_id in compiled.subnet_ids:
+                index.by_subnet.setdefault(subnet_id, pos)
+            if compiled.match_all or compiled.delegation_types:
+                index.general.append((pos, compiled))
+        return index
+
+    def match(
+        self,
+        delegator_address: str,
+        delegation_type_value: str,
+        subnet_id: int | None,
+    ) -> RakebackParticipants | None:
+        best: int = len(self.participants)
+        best = min(best, self.by_address.get(delegator_address, best))
+        if subnet_id is not None:
+            best = min(best, self.by_subnet.get(subnet_id, best))
+        for pos, compiled in self.general:
+            if pos >= best:
+                break
+            if compiled.matches(delegator_address, delegation_type_value, subnet_id):
+                best = pos
+                break
+        return self.participants[best] if best < len(self.participants) else None
+
+
+@lru_cache(maxsize=1024)
+def _validate_rules(raw: str | None) -> tuple[str, ...]:
+    # Same keying as _compile_rules: the result depends only on the JSON text.
+    rules: list[Rule] = _parse_rules(raw)
+    if not rules:
+        return ("No matching rules defined",)
+    return tuple(
+        f"Rule {i}: {err}" for i, rule in enumerate(rules) for err in rule.validate(_VALID_DTYPES)
+    )
+
+
 class RulesEngine:
-    """Matches delegators to rakeback participants using configurable rules."""
+    """Matches delegators to rakeback participants using configurable rules.
+
+    ``match_delegator`` indexes the active participants once per date and
+    reuses the index for the engine's lifetime; call ``invalidate`` after
+    changing participants through the same engine's session.
+    """
 
     def __init__(self, session: Session) -> None:
         self.session: Session = session
+        self._indexes: dict[str, _ParticipantIndex] = {}
+
+    def invalidate(self) -> None:
+        """Drop the cached participant indexes so the next match reloads them."""
+        self._indexes.clear()
 
     def match_delegator(
         self,
@@ -117,31 +259,22 @@ class RulesEngine:
         as_of_date: date | None = None,
     ) -> RakebackParticipants | None:
         check_date: str = (as_of_date or date.today()).isoformat()
-        participants: Sequence[RakebackParticipants] = self._get_active_participants(check_date)
-        for p in participants:
-            rules: list[Rule] = self._rules_list(p)
-            if any(r.matches(delegator_address, delegation_type.value, subnet_id) for r in rules):
-                return p
-        return None
+        index: _ParticipantIndex | None = self._indexes.get(check_date)
+        if index is None:
+            index = _ParticipantIndex.build(self._get_active_participants(check_date))
+            self._indexes[check_date] = index
+        return index.match(delegator_address, delegation_type.value, subnet_id)
 
     def match_addresses(
         self,
         participant: RakebackParticipants,
         addresses: Sequence[str],
     ) -> list[str]:
-        rules: list[Rule] = self._rules_list(participant)
-        return [a for a in addresses if any(r.matches_address(a) for r in rules)]
+        compiled: _CompiledRules = _compile_rules(participant.matching_rules)
+        return [a for a in addresses if compiled.matches_address(a)]
 
     def validate_rules(self, participant: RakebackParticipants) -> list[str]:
-        rules: list[Rule] = self._rules_list(participant)
-        if not rules:
-            return ["No matching rules defined"]
-        valid_dtypes: set[str] = {dt.value for dt in DelegationType}
-        errors: list[str] = []
-        for i, rule in enumerate(rules):
-            for err in rule.validate(valid_dtypes):
-                errors.append(f"Rule {i}: {err}")
-        return errors
+        return list(_validate_rules(participant.matching_rules))
 
     def get_rules_snapshot(self, as_of: date) -> RulesSnapshot:
         check_date: str = as_of.isoformat()
@@ -179,15 +312,3 @@ class RulesEngine:
             .order_by(RakebackParticipants.priority, RakebackParticipants.id)
         )
         return self.session.scalars(stmt).all()
-
-    @staticmethod
-    def _rules_list(participant: RakebackParticipants) -> list[Rule]:
-        raw: str | None = participant.matching_rules
-        mr: JsonDict | None = load_json(raw) if isinstance(raw, str) else None
-        if not isinstance(mr, dict):
-            return []
-        raw_rules: object = mr.get("rules")
-        if not isinstance(raw_rules, list):
-            return []
-        parsed: list[Rule | None] = [Rule.from_dict(r) for r in raw_rules if isinstance(r, dict)]
-        return [r for r in parsed if r is not None]
@@ -1,9 +1,12 @@
 """Service for fetching and storing TAO price data."""
 
+import http.client
 import json
+import time
 import urllib.request
 from datetime import UTC, datetime
 from decimal import Decimal
+from urllib.parse import urljoin, urlsplit
 
 import structlog
 from sqlalchemy import Select, select
@@ -15,45 +18,125 @@ from rakeback.services._helpers import new_id, now_iso
 logger = structlog.get_logger(__name__)
 
 TAOSTATS_PRICE_URL = "https://api.taostats.io/api/price/latest/v1"
+_TAOSTATS_URL_PARTS = urlsplit(TAOSTATS_PRICE_URL)
+_REQUEST_TIMEOUT: int = 15
+# Errors that mean the kept-alive connection went stale before the request got
+# through; anything else (timeouts included) is not worth a second attempt.
+_STALE_CONNECTION_ERRORS: tuple[type[OSError], ...] = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
 
 
 class TaoPriceService:
-    """Fetches TAO/USD prices from TaoStats and stores them locally."""
+    """Fetches TAO/USD prices from TaoStats and stores them locally.
 
-    def __init__(self, session: Session, api_key: str = "") -> None:
+    The TaoStats connection is kept open between calls, a fetched price is
+    reused (and not stored again) for ``min_fetch_interval`` seconds, and price
+    lookups are memoised until the next price is stored.
+    """
+
+    def __init__(
+        self, session: Session, api_key: str = "", min_fetch_interval: float = 60.0
+    ) -> None:
         self.session: Session = session
         self.api_key: str = api_key
+        self.min_fetch_interval: float = min_fetch_interval
+        self._conn: http.client.HTTPSConnection | None = None
+        self._fetched: tuple[float, Decimal] | None = None
+        self._by_timestamp: dict[str, Decimal | None] = {}
+        self._by_block: dict[int, Decimal | None] = {}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _request_price_json(self) -> object:
+        """GET the TaoStats price endpoint over a kept-alive HTTPS connection."""
+        headers: dict[str, str] = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["x-api-key"] = self.api_key
+        path: str = _TAOSTATS_URL_PARTS.path or "/"
+        # A kept-alive connection may have been dropped by the server since the
+        # last call; retry once on a fresh connection before giving up.
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = http.client.HTTPSConnection(
+                    _TAOSTATS_URL_PARTS.netloc, timeout=_REQUEST_TIMEOUT
+                )
+            try:
+                self._conn.request("GET", path, headers=headers)
+                resp: http.client.HTTPResponse = self._conn.getresponse()
+                body: bytes = resp.read()
+            except _STALE_CONNECTION_ERRORS:
+                self.close()
+                if attempt:
+                    raise
+                continue
+            except (http.client.HTTPException, OSError):
+                self.close()
+                raise
+            if 300 <= resp.status < 400:
+                location: str | None = resp.getheader("Location")
+                if not location:
+                    raise http.client.HTTPException(
+                        f"TaoStats returned HTTP {resp.status} without a Location header"
+                    )
+                # Only the canonical endpoint is kept alive; follow a redirect
+                # with a one-off request, as urllib did before.
+                return self._request_redirected_json(urljoin(TAOSTATS_PRICE_URL, location), headers)
+            if resp.status >= 400:
+                raise http.client.HTTPException(f"TaoStats returned HTTP {resp.status}")
+            return json.loads(body)
+        return None
+
+    @staticmethod
+    def _request_redirected_json(url: str, headers: dict[str, str]) -> object:
+        req: urllib.request.Request = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=_REQUEST_TIMEOUT) as resp:
+            return json.loads(resp.read())
+
+    def _fetch_price(self) -> tuple[Decimal, bool] | None:
+        """Return (price, fresh); ``fresh`` is False when a recent fetch was reused."""
+        now: float = time.monotonic()
+        if self._fetched is not None and now - self._fetched[0] < self.min_fetch_interval:
+            return self._fetched[1], False
+
+        data: object = self._request_price_json()
+
+        price_usd: Decimal | None = None
+        if isinstance(data, dict):
+            items: object = data.get("data") or data.get("results") or []
+            if isinstance(items, list) and items:
+                entry: object = items[0]
+                if isinstance(entry, dict):
+                    price_usd = Decimal(
+                        str(entry.get("close") or entry.get("price") or entry.get("price_usd", 0))
+                    )
+            elif "price" in data:
+                price_usd = Decimal(str(data["price"]))
+
+        if price_usd is None or price_usd <= 0:
+            logger.warning("Could not parse TAO price from API response")
+            return None
+        self._fetched = (now, price_usd)
+        return price_usd, True
 
     def fetch_and_store(self, block_number: int | None = None) -> Decimal | None:
         try:
-            req: urllib.request.Request = urllib.request.Request(TAOSTATS_PRICE_URL)
-            req.add_header("Content-Type", "application/json")
-            if self.api_key:
-                req.add_header("x-api-key", self.api_key)
-
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                data: object = json.loads(resp.read().decode())
-
-            price_usd: Decimal | None = None
-            if isinstance(data, dict):
-                items: object = data.get("data") or data.get("results") or []
-                if isinstance(items, list) and items:
-                    entry: object = items[0]
-                    if isinstance(entry, dict):
-                        price_usd = Decimal(
-                            str(
-                                entry.get("close")
-                                or entry.get("price")
-                                or entry.get("price_usd", 0)
-                            )
-                        )
-                elif "price" in data:
-                    price_usd = Decimal(str(data["price"]))
-
-            if price_usd is None or price_usd <= 0:
-                logger.warning("Could not parse TAO price from API response")
+            fetched: tuple[Decimal, bool] | None = self._fetch_price()
+            if fetched is None:
                 return None
 
+            price_usd: Decimal
+            fresh: bool
+            price_usd, fresh = fetched
+            if not fresh:
+                # Already stored when it was fetched; another row would only repeat it.
+                return price_usd
+
             now: datetime = datetime.now(UTC)
             price: TaoPrices = TaoPrices(
                 id=new_id(),
@@ -65,6 +148,8 @@ class TaoPriceService:
             )
             self.session.add(price)
             self.session.flush()
+            self._by_timestamp.clear()
+            self._by_block.clear()
 
             logger.info("Stored TAO price", price_usd=str(price_usd))
             return price_usd
@@ -75,6 +160,11 @@ class TaoPriceService:
 
     def get_price_at_timestamp(self, ts: datetime) -> Decimal | None:
         ts_str: str = ts.isoformat()
+        if ts_str not in self._by_timestamp:
+            self._by_timestamp[ts_str] = self._lookup_price_at_timestamp(ts_str)
+        return self._by_timestamp[ts_str]
+
+    def _lookup_price_at_timestamp(self, ts_str: str) -> Decimal | None:
         stmt_before: Select[tuple[TaoPrices]] = (
             select(TaoPrices)
             .where(TaoPrices.timestamp <= ts_str)
@@ -97,6 +187,11 @@ class TaoPriceService:
         return Decimal(str(record.price_usd)) if record else None
 
     def get_price_at_block(self, block_number: int) -> Decimal | None:
+        if block_number not in self._by_block:
+            self._by_block[block_number] = self._lookup_price_at_block(block_number)
+        return self._by_block[block_number]
+
+    def _lookup_price_at_block(self, block_number: int) -> Decimal | None:
         stmt: Select[tuple[TaoPrices]] = (
             select(TaoPrices).where(TaoPrices.block_number == block_number).limit(1)
         )
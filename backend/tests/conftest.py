@@ -1,18 +1,38 @@
 """Shared fixtures — in-memory SQLite DB with all tables."""
 
+import sqlite3
 from collections.abc import Generator
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine, RootTransaction
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
 from db.models import Base
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def engine() -> Generator[Engine, None, None]:
-    eng: Engine = create_engine("sqlite:///:memory:", echo=False)
+    """One in-memory database for the whole run; the schema is created once."""
+    eng: Engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite defers BEGIN until the first DML statement, so a SAVEPOINT issued
+    # first would open (and its RELEASE commit) the real transaction. Hand
+    # transaction control to SQLAlchemy so the outer rollback undoes everything.
+    @event.listens_for(eng, "connect")
+    def _no_pysqlite_autobegin(dbapi_conn: sqlite3.Connection, _record: object) -> None:
+        dbapi_conn.isolation_level = None
+
+    @event.listens_for(eng, "begin")
+    def _emit_begin(conn: Connection) -> None:
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(eng)
     yield eng
     eng.dispose()
@@ -20,13 +40,20 @@ def engine() -> Generator[Engine, None, None]:
 
 @pytest.fixture()
 def session(engine: Engine) -> Generator[Session, None, None]:
-    factory: sessionmaker[Session] = sessionmaker(
-        bind=engine,
-        autocommit=False,
+    """Session inside an outer transaction that is rolled back after each test.
+
+    Commits made by code under test only release a SAVEPOINT, so no test
+    leaves rows behind for the next one.
+    """
+    connection: Connection = engine.connect()
+    trans: RootTransaction = connection.begin()
+    sess: Session = Session(
+        bind=connection,
         autoflush=False,
         expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
     )
-    sess: Session = factory()
     yield sess
-    sess.rollback()
     sess.close()
+    trans.rollback()
+    connection.close()
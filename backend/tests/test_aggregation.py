@@ -1,8 +1,10 @@
 """Tests for rakeback.services.aggregation."""
 
+import secrets
 from datetime import date
 from decimal import Decimal
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from db.enums import CompletenessFlag, PeriodType
@@ -17,77 +19,99 @@ from rakeback.services._types import LedgerSummaryDict
 from rakeback.services.aggregation import AggregationResult, AggregationService
 
 VHK: str = "5FHneW46xGXgs5mUiveU4sbTyGBzmstUPZHb"
+BLOCK_HASH: str = "0x" + "a" * 64
+TOTAL_STAKE: Decimal = Decimal("1000")
+RAKEBACK_RATE: Decimal = Decimal("0.5")
+FULL_PROPORTION: Decimal = Decimal("1")
+ZERO: Decimal = Decimal(0)
+
+
+def _seed_participants(session: Session, specs: list[tuple[str, list[str] | None]]) -> list[str]:
+    """Insert one participant per (id, addresses) spec; no addresses means an ALL rule."""
+    ts: str = now_iso()
+    rows: list[dict[str, object]] = [
+        {
+            "id": pid,
+            "name": "Test",
+            "type": "PARTNER",
+            "matching_rules": dump_json(
+                {"rules": [{"type": "EXACT_ADDRESS", "addresses": addresses}]}
+                if addresses
+                else {"rules": [{"type": "ALL"}]}
+            ),
+            "rakeback_percentage": RAKEBACK_RATE,
+            "effective_from": "2020-01-01",
+            "payout_address": "5FHne...",
+            "priority": 1,
+            "created_at": ts,
+            "updated_at": ts,
+        }
+        for pid, addresses in specs
+    ]
+    session.execute(insert(RakebackParticipants), rows)
+    return [pid for pid, _ in specs]
 
 
 def _seed_participant(
     session: Session, pid: str = "partner-test", addresses: list[str] | None = None
-) -> RakebackParticipants:
-    rules: list[dict[str, object]] = [{"type": "ALL"}]
-    if addresses:
-        rules = [{"type": "EXACT_ADDRESS", "addresses": addresses}]
-    ts: str = now_iso()
-    p: RakebackParticipants = RakebackParticipants(
-        id=pid,
-        name="Test",
-        type="PARTNER",
-        matching_rules=dump_json({"rules": rules}),
-        rakeback_percentage=0.5,
-        effective_from="2020-01-01",
-        payout_address="5FHne...",
-        priority=1,
-        created_at=ts,
-        updated_at=ts,
-    )
-    session.add(p)
-    session.flush()
-    return p
+) -> str:
+    return _seed_participants(session, [(pid, addresses)])[0]
 
 
 def _seed_snapshot(session: Session, block: int, ts: str = "2026-01-15T00:00:00") -> None:
-    s: BlockSnapshots = BlockSnapshots(
-        block_number=block,
-        validator_hotkey=VHK,
-        block_hash="0x" + "a" * 64,
-        timestamp=ts,
-        ingestion_timestamp=now_iso(),
-        total_stake=Decimal("1000"),
+    session.execute(
+        insert(BlockSnapshots),
+        [
+            {
+                "block_number": block,
+                "validator_hotkey": VHK,
+                "block_hash": BLOCK_HASH,
+                "timestamp": ts,
+                "ingestion_timestamp": now_iso(),
+                "total_stake": TOTAL_STAKE,
+            }
+        ],
     )
-    session.add(s)
-    session.flush()
 
 
 def _seed_attribution(
     session: Session, block: int, delegator: str, dtao: Decimal, run_id: str = "run-1"
 ) -> None:
-    a: BlockAttributions = BlockAttributions(
-        id=new_id(),
-        block_number=block,
-        validator_hotkey=VHK,
-        delegator_address=delegator,
-        delegation_type="ROOT_TAO",
-        attributed_dtao=dtao,
-        delegation_proportion=Decimal("1"),
-        completeness_flag=CompletenessFlag.COMPLETE.value,
-        computation_timestamp=now_iso(),
-        run_id=run_id,
+    session.execute(
+        insert(BlockAttributions),
+        [
+            {
+                "id": new_id(),
+                "block_number": block,
+                "validator_hotkey": VHK,
+                "delegator_address": delegator,
+                "delegation_type": "ROOT_TAO",
+                "attributed_dtao": dtao,
+                "delegation_proportion": FULL_PROPORTION,
+                "completeness_flag": CompletenessFlag.COMPLETE.value,
+                "computation_timestamp": now_iso(),
+                "run_id": run_id,
+            }
+        ],
     )
-    session.add(a)
-    session.flush()
 
 
 def _seed_conversion(session: Session, block: int, dtao: Decimal, tao: Decimal) -> None:
-    c: ConversionEvents = ConversionEvents(
-        id=new_id(),
-        block_number=block,
-        transaction_hash="0x" + new_id()[:60],
-        validator_hotkey=VHK,
-        dtao_amount=dtao,
-        tao_amount=tao,
-        conversion_rate=(tao / dtao) if dtao else Decimal(0),
-        ingestion_timestamp=now_iso(),
+    session.execute(
+        insert(ConversionEvents),
+        [
+            {
+                "id": new_id(),
+                "block_number": block,
+                "transaction_hash": f"0x{secrets.token_hex(32)}",
+                "validator_hotkey": VHK,
+                "dtao_amount": dtao,
+                "tao_amount": tao,
+                "conversion_rate": (tao / dtao) if dtao else ZERO,
+                "ingestion_timestamp": now_iso(),
+            }
+        ],
     )
-    session.add(c)
-    session.flush()
 
 
 class TestAggregateDailyNoData:
@@ -3,17 +3,19 @@
 from decimal import Decimal
 
 import pytest
+from sqlalchemy import exists, func, insert, select
 from sqlalchemy.orm import Session
 
 from db.enums import CompletenessFlag, GapType
 from db.models import (
+    Base,
     BlockAttributions,
     BlockSnapshots,
     BlockYields,
     DataGaps,
     DelegationEntries,
 )
-from rakeback.services._helpers import new_id, now_iso
+from rakeback.services._helpers import new_ids, now_iso
 from rakeback.services.attribution import (
     AttributionEngine,
     AttributionResult,
@@ -21,6 +23,9 @@ from rakeback.services.attribution import (
 )
 
 VHK: str = "5FHneW46xGXgs5mUiveU4sbTyGBzmstUPZHb"
+BLOCK_HASH: str = "0x" + "a" * 64
+TOTAL_STAKE: Decimal = Decimal("1000")
+DELEGATION_BALANCE: Decimal = Decimal("100")
 
 
 def _seed_snapshot(
@@ -30,31 +35,38 @@ def _seed_snapshot(
     completeness: str = "COMPLETE",
 ) -> None:
     """Seed a snapshot with optional delegations (address, proportion) pairs."""
-    snap = BlockSnapshots(
-        block_number=block,
-        validator_hotkey=VHK,
-        block_hash="0x" + "a" * 64,
-        timestamp="2026-01-15T00:00:00",
-        ingestion_timestamp=now_iso(),
-        completeness_flag=completeness,
-        total_stake=Decimal("1000"),
+    session.execute(
+        insert(BlockSnapshots),
+        [
+            {
+                "block_number": block,
+                "validator_hotkey": VHK,
+                "block_hash": BLOCK_HASH,
+                "timestamp": "2026-01-15T00:00:00",
+                "ingestion_timestamp": now_iso(),
+                "completeness_flag": completeness,
+                "total_stake": TOTAL_STAKE,
+            }
+        ],
     )
-    session.add(snap)
-    session.flush()
-
     if delegations:
-        for addr, proportion in delegations:
-            entry = DelegationEntries(
-                id=new_id(),
-                block_number=block,
-                validator_hotkey=VHK,
-                delegator_address=addr,
-                delegation_type="ROOT_TAO",
-                balance_dtao=Decimal("100"),
-                proportion=proportion,
-            )
-            session.add(entry)
-        session.flush()
+        session.execute(
+            insert(DelegationEntries),
+            [
+                {
+                    "id": row_id,
+                    "block_number": block,
+                    "validator_hotkey": VHK,
+                    "delegator_address": addr,
+                    "delegation_type": "ROOT_TAO",
+                    "balance_dtao": DELEGATION_BALANCE,
+                    "proportion": proportion,
+                }
+                for row_id, (addr, proportion) in zip(
+                    new_ids(len(delegations)), delegations, strict=True
+                )
+            ],
+        )
 
 
 def _seed_yield(
@@ -63,15 +75,38 @@ def _seed_yield(
     dtao: Decimal,
     completeness: str = "COMPLETE",
 ) -> None:
-    by = BlockYields(
-        block_number=block,
-        validator_hotkey=VHK,
-        total_dtao_earned=dtao,
-        completeness_flag=completeness,
-        ingestion_timestamp=now_iso(),
+    session.execute(
+        insert(BlockYields),
+        [
+            {
+                "block_number": block,
+                "validator_hotkey": VHK,
+                "total_dtao_earned": dtao,
+                "completeness_flag": completeness,
+                "ingestion_timestamp": now_iso(),
+            }
+        ],
     )
-    session.add(by)
-    session.flush()
+
+
+def _attributed_total(session: Session) -> Decimal:
+    """Sum of attributed dTAO across all rows, computed in SQL."""
+    return session.execute(select(func.sum(BlockAttributions.attributed_dtao))).scalar_one()
+
+
+def _is_empty(session: Session, model: type[Base]) -> bool:
+    """True if the model's table has no rows; stops at the first row found."""
+    return not session.scalar(select(exists().select_from(model)))
+
+
+def _gap_summary(session: Session, gap_type: GapType) -> tuple[int, int | None]:
+    """(number of gaps, lowest block_start) for one gap type, in a single aggregate."""
+    count, first_block = session.execute(
+        select(func.count(), func.min(DataGaps.block_start)).where(
+            DataGaps.gap_type == gap_type.value
+        )
+    ).one()
+    return count, first_block
 
 
 class TestSingleDelegator:
@@ -132,9 +167,7 @@ class TestUnequalProportionsRemainder:
         result = engine.run_attribution(100, 100, VHK)
 
         assert result.attributions_created == 3
-        rows = session.query(BlockAttributions).all()
-        total = sum(r.attributed_dtao for r in rows)
-        assert total == Decimal("7")
+        assert _attributed_total(session) == Decimal("7")
 
 
 class TestSumAlwaysEqualsTotal:
@@ -153,9 +186,8 @@ class TestSumAlwaysEqualsTotal:
         engine = AttributionEngine(session)
         result = engine.run_attribution(100, 100, VHK)
 
-        rows = session.query(BlockAttributions).all()
-        total = sum(r.attributed_dtao for r in rows)
-        assert total == Decimal("999")
+        assert session.query(BlockAttributions).count() == 3
+        assert _attributed_total(session) == Decimal("999")
         assert result.total_dtao_attributed == Decimal("999")
 
 
@@ -170,7 +202,7 @@ class TestZeroYield:
         assert result.attributions_created == 0
         assert result.total_dtao_attributed == Decimal("0")
         assert result.completeness_summary[CompletenessFlag.COMPLETE.value] == 1
-        assert session.query(BlockAttributions).count() == 0
+        assert _is_empty(session, BlockAttributions)
 
 
 class TestNoDelegations:
@@ -196,9 +228,7 @@ class TestMissingSnapshot:
 
         # Block returns None → counted as incomplete
         assert result.blocks_incomplete == 1
-        gaps = session.query(DataGaps).filter(DataGaps.gap_type == GapType.SNAPSHOT.value).all()
-        assert len(gaps) == 1
-        assert gaps[0].block_start == 100
+        assert _gap_summary(session, GapType.SNAPSHOT) == (1, 100)
 
 
 class TestMissingYield:
@@ -210,38 +240,46 @@ class TestMissingYield:
         result = engine.run_attribution(100, 100, VHK)
 
         assert result.blocks_incomplete == 1
-        gaps = session.query(DataGaps).filter(DataGaps.gap_type == GapType.YIELD.value).all()
-        assert len(gaps) == 1
-        assert gaps[0].block_start == 100
+        assert _gap_summary(session, GapType.YIELD) == (1, 100)
 
 
-class TestCompletenessPropagation:
-    def test_complete_plus_complete_is_complete(self, session: Session) -> None:
-        _seed_snapshot(session, 100, [("d1", Decimal("1"))], completeness="COMPLETE")
-        _seed_yield(session, 100, Decimal("100"), completeness="COMPLETE")
+class TestGapConsolidation:
+    def test_deferred_consolidation(self, session: Session) -> None:
+        # Missing snapshots at two adjacent blocks record two gaps.
+        _seed_yield(session, 100, Decimal("1000"))
+        _seed_yield(session, 101, Decimal("1000"))
 
         engine = AttributionEngine(session)
-        result = engine.run_attribution(100, 100, VHK)
+        engine.run_attribution(100, 101, VHK, consolidate_gaps=False)
+        assert _gap_summary(session, GapType.SNAPSHOT) == (2, 100)
 
-        assert result.completeness_summary[CompletenessFlag.COMPLETE.value] == 1
+        engine.consolidate_gaps(VHK)
+        assert _gap_summary(session, GapType.SNAPSHOT) == (1, 100)
 
-    def test_complete_plus_partial_is_incomplete(self, session: Session) -> None:
-        _seed_snapshot(session, 100, [("d1", Decimal("1"))], completeness="COMPLETE")
-        _seed_yield(session, 100, Decimal("100"), completeness="PARTIAL")
 
-        engine = AttributionEngine(session)
-        result = engine.run_attribution(100, 100, VHK)
-
-        assert result.completeness_summary[CompletenessFlag.INCOMPLETE.value] == 1
-
-    def test_partial_plus_complete_is_incomplete(self, session: Session) -> None:
-        _seed_snapshot(session, 100, [("d1", Decimal("1"))], completeness="PARTIAL")
-        _seed_yield(session, 100, Decimal("100"), completeness="COMPLETE")
+class TestCompletenessPropagation:
+    @pytest.mark.parametrize(
+        ("snapshot_flag", "yield_flag", "expected"),
+        [
+            ("COMPLETE", "COMPLETE", CompletenessFlag.COMPLETE),
+            ("COMPLETE", "PARTIAL", CompletenessFlag.INCOMPLETE),
+            ("PARTIAL", "COMPLETE", CompletenessFlag.INCOMPLETE),
+        ],
+    )
+    def test_flags_combine(
+        self,
+        session: Session,
+        snapshot_flag: str,
+        yield_flag: str,
+        expected: CompletenessFlag,
+    ) -> None:
+        _seed_snapshot(session, 100, [("d1", Decimal("1"))], completeness=snapshot_flag)
+        _seed_yield(session, 100, Decimal("100"), completeness=yield_flag)
 
         engine = AttributionEngine(session)
         result = engine.run_attribution(100, 100, VHK)
 
-        assert result.completeness_summary[CompletenessFlag.INCOMPLETE.value] == 1
+        assert result.completeness_summary[expected.value] == 1
 
 
 class TestInvalidProportions:
@@ -272,4 +310,4 @@ class TestDryRun:
         assert result.attributions_created == 1
         assert result.total_dtao_attributed == Decimal("500")
         # No rows actually written
-        assert session.query(BlockAttributions).count() == 0
+        assert _is_empty(session, BlockAttributions)
@@ -1,21 +1,25 @@
 """Tests for rakeback.services.export."""
 
+import csv
+import gzip
 from datetime import date
 from decimal import Decimal
+from pathlib import Path
 
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
-from db.enums import CompletenessFlag, PaymentStatus, PeriodType
-from db.models import RakebackLedgerEntries
-from rakeback.services._helpers import new_id, now_iso
+from db.enums import CompletenessFlag, PaymentStatus, PeriodType, RunStatus
+from db.models import Base, ProcessingRuns, RakebackLedgerEntries, RakebackParticipants
+from rakeback.services._helpers import new_id, new_ids, now_iso
 from rakeback.services._types import ExportDataDict, ExportListDict, SummaryReportDict
-from rakeback.services.export import ExportService
+from rakeback.services.export import ExportResult, ExportService
 
 
-def _seed_ledger_entry(session: Session, **overrides: object) -> RakebackLedgerEntries:
-    ts: str = now_iso()
+def _ledger_row(row_id: str, ts: str, **overrides: object) -> dict[str, object]:
     defaults: dict[str, object] = {
-        "id": new_id(),
+        "id": row_id,
         "period_type": PeriodType.DAILY.value,
         "period_start": "2026-01-15",
         "period_end": "2026-01-15",
@@ -33,12 +37,28 @@ def _seed_ledger_entry(session: Session, **overrides: object) -> RakebackLedgerE
         "updated_at": ts,
     }
     defaults.update(overrides)
-    entry: RakebackLedgerEntries = RakebackLedgerEntries(**defaults)
+    return defaults
+
+
+def _seed_ledger_entry(session: Session, **overrides: object) -> RakebackLedgerEntries:
+    entry: RakebackLedgerEntries = RakebackLedgerEntries(
+        **_ledger_row(new_id(), now_iso(), **overrides)
+    )
     session.add(entry)
-    session.flush()
     return entry
 
 
+def _seed_ledger_entries(session: Session, overrides_list: list[dict[str, object]]) -> list[str]:
+    """Insert one ledger entry per overrides dict in a single executemany; returns the ids."""
+    ts: str = now_iso()
+    rows: list[dict[str, object]] = [
+        _ledger_row(row_id, ts, **overrides)
+        for row_id, overrides in zip(new_ids(len(overrides_list)), overrides_list, strict=True)
+    ]
+    session.execute(insert(RakebackLedgerEntries), rows)
+    return [str(row["id"]) for row in rows]
+
+
 class TestListExports:
     def test_empty(self, session: Session) -> None:
         svc: ExportService = ExportService(session)
@@ -49,6 +69,7 @@ class TestListExports:
 class TestGenerateExport:
     def test_json_format(self, session: Session) -> None:
         _seed_ledger_entry(session)
+        session.flush()
         svc: ExportService = ExportService(session)
         result: ExportDataDict = svc.generate_export("json")
         assert result["format"] == "json"
@@ -57,6 +78,7 @@ class TestGenerateExport:
 
     def test_csv_format(self, session: Session) -> None:
         _seed_ledger_entry(session)
+        session.flush()
         svc: ExportService = ExportService(session)
         result: ExportDataDict = svc.generate_export("csv")
         assert result["format"] == "csv"
@@ -66,40 +88,190 @@ class TestGenerateExport:
     def test_filter_by_partner(self, session: Session) -> None:
         _seed_ledger_entry(session, participant_id="partner-a")
         _seed_ledger_entry(session, participant_id="partner-b")
+        session.flush()
         svc: ExportService = ExportService(session)
         result: ExportDataDict = svc.generate_export("json", partner_id="partner-a")
         assert result["record_count"] == 1
 
 
+class TestExportLedgerCsv:
+    def test_writes_rows_and_totals(self, session: Session, tmp_path: Path) -> None:
+        _seed_ledger_entry(session, participant_id="partner-a", tao_owed=10.0)
+        _seed_ledger_entry(
+            session,
+            participant_id="partner-b",
+            tao_owed=5.0,
+            completeness_flag=CompletenessFlag.INCOMPLETE.value,
+        )
+        session.flush()
+        svc: ExportService = ExportService(session, export_dir=str(tmp_path))
+        result: ExportResult = svc.export_ledger_csv(
+            PeriodType.DAILY, date(2026, 1, 1), date(2026, 1, 31)
+        )
+        assert result.row_count == 2
+        assert result.complete_entries == 1
+        assert result.incomplete_entries == 1
+        assert result.total_tao == Decimal("15")
+        assert result.warnings == ["1 entries have incomplete data"]
+
+        lines: list[str] = result.output_path.read_text(encoding="utf-8").splitlines()
+        assert "# Incomplete entries: 1" in lines
+        header_idx: int = lines.index(",".join(ExportService._CSV_COLUMNS))
+        assert len(lines) - header_idx - 1 == 2
+
+    def test_filters_participants(self, session: Session, tmp_path: Path) -> None:
+        _seed_ledger_entry(session, participant_id="partner-a")
+        _seed_ledger_entry(session, participant_id="partner-b")
+        session.flush()
+        svc: ExportService = ExportService(session, export_dir=str(tmp_path))
+        result: ExportResult = svc.export_ledger_csv(
+            PeriodType.DAILY,
+            date(2026, 1, 1),
+            date(2026, 1, 31),
+            participant_ids=["partner-a"],
+        )
+        assert result.row_count == 1
+        assert result.warnings == []
+
+    def test_includes_participant_name(self, session: Session, tmp_path: Path) -> None:
+        ts: str = now_iso()
+        session.add(
+            RakebackParticipants(
+                id="partner-a",
+                name='Creative Builds, "CB"',
+                type="PARTNER",
+                rakeback_percentage=0.33,
+                effective_from="2020-01-01",
+                payout_address="5FHne...",
+                created_at=ts,
+                updated_at=ts,
+            )
+        )
+        _seed_ledger_entry(session, participant_id="partner-a")
+        _seed_ledger_entry(session, participant_id="partner-unknown")
+        session.flush()
+        svc: ExportService = ExportService(session, export_dir=str(tmp_path))
+        result: ExportResult = svc.export_ledger_csv(
+            PeriodType.DAILY, date(2026, 1, 1), date(2026, 1, 31)
+        )
+        with result.output_path.open(newline="", encoding="utf-8") as f:
+            names: dict[str, str] = {
+                r[0]: r[-1] for r in csv.reader(f) if r and r[0].startswith("partner-")
+            }
+        assert names == {"partner-a": 'Creative Builds, "CB"', "partner-unknown": ""}
+
+    def test_compress_writes_gzip(self, session: Session, tmp_path: Path) -> None:
+        _seed_ledger_entry(session)
+        session.flush()
+        svc: ExportService = ExportService(session, export_dir=str(tmp_path))
+        result: ExportResult = svc.export_ledger_csv(
+            PeriodType.DAILY, date(2026, 1, 1), date(2026, 1, 31), compress=True
+        )
+        assert result.output_path.name == "rakeback_DAILY_2026-01-01_2026-01-31.csv.gz"
+        with gzip.open(result.output_path, "rt", newline="", encoding="utf-8") as f:
+            rows: list[list[str]] = [r for r in csv.reader(f) if r]
+        assert rows[-1][0] == "partner-test"
+
+    def test_per_participant_files(self, tmp_path: Path) -> None:
+        # File-backed DB so the worker threads' sessions see the committed rows.
+        eng: Engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+        Base.metadata.create_all(eng)
+        with Session(eng) as session:
+            _seed_ledger_entries(
+                session,
+                [
+                    {"participant_id": "partner-a"},
+                    {
+                        "participant_id": "partner-a",
+                        "period_start": "2026-01-16",
+                        "period_end": "2026-01-16",
+                    },
+                    {"participant_id": "partner-b"},
+                ],
+            )
+            session.commit()
+            svc: ExportService = ExportService(session, export_dir=str(tmp_path))
+            results: list[ExportResult] = svc.export_ledger_csv_per_participant(
+                PeriodType.DAILY,
+                date(2026, 1, 1),
+                date(2026, 1, 31),
+                ["partner-a", "partner-b", "partner-a"],
+                max_workers=2,
+            )
+            runs: list[ProcessingRuns] = list(
+                session.scalars(select(ProcessingRuns).order_by(ProcessingRuns.started_at))
+            )
+        eng.dispose()
+        assert [r.row_count for r in results] == [2, 1]
+        assert [r.output_path.name for r in results] == [
+            "rakeback_DAILY_partner-a_2026-01-01_2026-01-31.csv",
+            "rakeback_DAILY_partner-b_2026-01-01_2026-01-31.csv",
+        ]
+        assert {r.run_id for r in runs} == {r.run_id for r in results}
+        assert all(r.status == RunStatus.SUCCESS.value for r in runs)
+
+    def test_per_participant_filename_is_sanitized(self, session: Session, tmp_path: Path) -> None:
+        svc: ExportService = ExportService(session, export_dir=str(tmp_path))
+        results: list[ExportResult] = svc.export_ledger_csv_per_participant(
+            PeriodType.DAILY, date(2026, 1, 1), date(2026, 1, 31), ["../../etc/passwd"]
+        )
+        assert results[0].output_path.parent == tmp_path
+        assert results[0].output_path.name == "rakeback_DAILY_etc-passwd_2026-01-01_2026-01-31.csv"
+
+    def test_streams_in_chunks(self, session: Session) -> None:
+        _seed_ledger_entries(session, [{"participant_id": f"partner-{i}"} for i in range(5)])
+        svc: ExportService = ExportService(session)
+        chunks: list[int] = [len(c) for c in svc._iter_export_rows(PeriodType.DAILY, chunk_size=2)]
+        assert chunks == [2, 2, 1]
+
+
 class TestMarkEntriesPaid:
     def test_marks_unpaid(self, session: Session) -> None:
         e: RakebackLedgerEntries = _seed_ledger_entry(session)
+        session.flush()
         svc: ExportService = ExportService(session)
         count: int = svc.mark_entries_paid([e.id], "0xabc123")
         assert count == 1
 
-        session.expire(e)
-        assert e.payment_status == PaymentStatus.PAID.value
-        assert e.payment_tx_hash == "0xabc123"
+        status, tx_hash = session.execute(
+            select(
+                RakebackLedgerEntries.payment_status, RakebackLedgerEntries.payment_tx_hash
+            ).where(RakebackLedgerEntries.id == e.id)
+        ).one()
+        assert status == PaymentStatus.PAID.value
+        assert tx_hash == "0xabc123"
 
     def test_skips_already_paid(self, session: Session) -> None:
         e: RakebackLedgerEntries = _seed_ledger_entry(
             session,
             payment_status=PaymentStatus.PAID.value,
         )
+        session.flush()
         svc: ExportService = ExportService(session)
         count: int = svc.mark_entries_paid([e.id], "0xnew")
         assert count == 0
 
+    def test_marks_many_and_ignores_duplicates(self, session: Session) -> None:
+        ids: list[str] = _seed_ledger_entries(
+            session, [{"participant_id": f"p{i}"} for i in range(3)]
+        )
+        svc: ExportService = ExportService(session)
+        assert svc.mark_entries_paid([*ids, ids[0]], "0xbatch") == 3
+        assert svc.mark_entries_paid([], "0xbatch") == 0
+
 
 class TestSummaryReport:
     def test_with_entries(self, session: Session) -> None:
-        _seed_ledger_entry(session, tao_owed=10.0, participant_id="partner-a")
-        _seed_ledger_entry(
+        _seed_ledger_entries(
             session,
-            tao_owed=5.0,
-            participant_id="partner-b",
-            payment_status=PaymentStatus.PAID.value,
+            [
+                {"tao_owed": 10.0, "participant_id": "partner-a"},
+                {
+                    "tao_owed": 5.0,
+                    "participant_id": "partner-b",
+                    "payment_status": PaymentStatus.PAID.value,
+                },
+            ],
         )
         svc: ExportService = ExportService(session)
         report: SummaryReportDict = svc.generate_summary_report(
@@ -109,3 +281,6 @@ class TestSummaryReport:
         )
         assert report["totals"]["entries"] == 2
         assert Decimal(report["totals"]["total_tao_owed"]) == Decimal("15")
+        assert report["by_payment_status"] == {"PAID": 1, "UNPAID": 1}
+        assert report["by_completeness"] == {"COMPLETE": 2}
+        assert Decimal(report["by_participant"]["partner-a"]["tao_owed"]) == Decimal("10")
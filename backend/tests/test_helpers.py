@@ -1,8 +1,16 @@
 """Tests for rakeback.services._helpers."""
 
 import json
+from uuid import UUID
 
-from rakeback.services._helpers import dump_json, load_json, new_id, now_iso, today_iso
+from rakeback.services._helpers import (
+    dump_json,
+    load_json,
+    new_id,
+    new_ids,
+    now_iso,
+    today_iso,
+)
 
 
 def test_new_id_uniqueness() -> None:
@@ -10,6 +18,14 @@ def test_new_id_uniqueness() -> None:
     assert len(ids) == 100
 
 
+def test_new_ids() -> None:
+    ids: list[str] = new_ids(100)
+    assert len(set(ids)) == 100
+    assert all(UUID(i).version == 4 for i in ids)
+    assert len(new_id()) == len(ids[0])
+    assert new_ids(0) == []
+
+
 def test_now_iso_format() -> None:
     ts: str = now_iso()
     assert "T" in ts
@@ -0,0 +1,339 @@
+"""Tests for rakeback.services.ingestion."""
+
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from db.enums import RunStatus
+from db.models import (
+    Base,
+    BlockSnapshots,
+    BlockYields,
+    ConversionEvents,
+    DataGaps,
+    DelegationEntries,
+    ProcessingRuns,
+    YieldSources,
+)
+from rakeback.services.chain_client import ChainClient
+from rakeback.services.errors import BlockNotFoundError, IngestionError
+from rakeback.services.ingestion import (
+    IngestionResult,
+    IngestionService,
+    _copy_buffer,
+    _merge_intervals,
+)
+from rakeback.services.schemas.chain import (
+    BlockYieldData,
+    ConversionData,
+    DelegationData,
+    ValidatorState,
+)
+
+VHK: str = "5FHneW46xGXgs5mUiveU4sbTyGBzmstUPZHb"
+
+
+class _FakeChainClient(ChainClient):
+    """In-memory chain: every block has one delegation and a yield, except ``missing``."""
+
+    def __init__(
+        self,
+        missing: set[int] | None = None,
+        conversions: list[ConversionData] | None = None,
+    ) -> None:
+        self.missing: set[int] = missing or set()
+        self.conversions: list[ConversionData] = conversions or []
+        self.calls: list[int] = []
+        self._connected = False
+
+    def connect(self) -> bool:
+        self._connected = True
+        return True
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def disconnect(self) -> None:
+        self._connected = False
+
+    def get_validator_state(self, block_number: int, validator_hotkey: str) -> ValidatorState:
+        self.calls.append(block_number)
+        if block_number in self.missing:
+            raise BlockNotFoundError(f"Block {block_number} not found")
+        return ValidatorState(
+            block_number=block_number,
+            block_hash=f"0x{block_number:064x}",
+            timestamp=datetime(2026, 1, 15, tzinfo=UTC),
+            validator_hotkey=validator_hotkey,
+            total_stake=Decimal("100"),
+            delegations=[
+                DelegationData(
+                    delegator_address="5Delegator",
+                    delegation_type="subnet_dtao",
+                    subnet_id=1,
+                    balance_dtao=Decimal("100"),
+                    balance_tao=None,
+                )
+            ],
+        )
+
+    def get_block_yield(self, block_number: int, validator_hotkey: str) -> BlockYieldData:
+        return BlockYieldData(
+            block_number=block_number,
+            validator_hotkey=validator_hotkey,
+            total_dtao_earned=Decimal("5"),
+            yield_by_subnet={1: Decimal("5")},
+        )
+
+    def get_conversion_events(
+        self,
+        start_block: int,
+        end_block: int,
+        validator_hotkey: str | None = None,
+    ) -> list[ConversionData]:
+        return [c for c in self.conversions if start_block <= c.block_number <= end_block]
+
+
+def _conversion(block: int, tx_hash: str) -> ConversionData:
+    return ConversionData(
+        block_number=block,
+        transaction_hash=tx_hash,
+        validator_hotkey=VHK,
+        dtao_amount=Decimal("10"),
+        tao_amount=Decimal("2"),
+        conversion_rate=Decimal("0.2"),
+        subnet_id=1,
+    )
+
+
+def _count(
+    session: Session,
+    model: type[Base],
+) -> int:
+    return session.scalar(select(func.count()).select_from(model)) or 0
+
+
+class TestIngestBlockRange:
+    def test_concurrent_fetch_stores_every_block(self, session: Session) -> None:
+        spawned: list[_FakeChainClient] = []
+
+        def factory() -> ChainClient:
+            client: _FakeChainClient = _FakeChainClient()
+            spawned.append(client)
+            return client
+
+        primary: _FakeChainClient = _FakeChainClient()
+        svc: IngestionService = IngestionService(
+            session, primary, fetch_workers=4, chain_client_factory=factory
+        )
+        result: IngestionResult = svc.ingest_block_range(100, 139, VHK)
+
+        assert result.blocks_created == 40
+        assert result.errors == []
+        assert _count(session, BlockSnapshots) == 40
+        assert _count(session, BlockYields) == 40
+        fetched: list[int] = primary.calls + [b for c in spawned for b in c.calls]
+        assert sorted(fetched) == list(range(100, 140))
+
+        # The pool survives the run: a second range reuses the warm clients
+        # instead of opening a fresh set, so at most one per extra worker.
+        svc.ingest_block_range(140, 179, VHK)
+        assert len(spawned) <= 3
+        assert all(c.is_connected() for c in spawned)
+
+        svc.close()
+        assert all(not c.is_connected() for c in spawned)
+        assert primary.is_connected()
+
+    def test_missing_blocks_become_gaps(self, session: Session) -> None:
+        svc: IngestionService = IngestionService(
+            session, _FakeChainClient(missing={102, 103}), fetch_workers=1
+        )
+        result: IngestionResult = svc.ingest_block_range(100, 105, VHK)
+
+        assert result.blocks_created == 4
+        assert result.gaps_detected == [(102, 103)]
+        assert result.errors == ["Block 102: not found", "Block 103: not found"]
+        run: ProcessingRuns | None = session.get(ProcessingRuns, result.run_id)
+        assert run is not None and run.error_details is not None
+        assert json.loads(run.error_details) == {
+            "errors": [{"reason": "not found", "ranges": [[102, 103]]}]
+        }
+        gaps: list[tuple[int, int]] = [
+            (g.block_start, g.block_end) for g in session.scalars(select(DataGaps))
+        ]
+        assert gaps == [(102, 103)]
+
+        rerun: IngestionResult = IngestionService(
+            session, _FakeChainClient(missing={102, 103}), fetch_workers=1
+        ).ingest_block_range(100, 103, VHK)
+        assert rerun.gaps_detected == [(102, 103)]
+        assert _count(session, DataGaps) == 1
+
+    def test_adjacent_gaps_extend_open_gap(self, session: Session) -> None:
+        client: _FakeChainClient = _FakeChainClient(missing={102, 103, 104, 105})
+        svc: IngestionService = IngestionService(session, client, fetch_workers=1)
+        svc.ingest_block_range(100, 103, VHK)
+        svc.ingest_block_range(104, 106, VHK)
+
+        gaps: list[tuple[int, int]] = [
+            (g.block_start, g.block_end) for g in session.scalars(select(DataGaps))
+        ]
+        assert gaps == [(102, 105)]
+
+    def test_skips_existing(self, session: Session) -> None:
+        svc: IngestionService = IngestionService(session, _FakeChainClient(), fetch_workers=1)
+        svc.ingest_block_range(100, 102, VHK)
+
+        client: _FakeChainClient = _FakeChainClient()
+        result: IngestionResult = IngestionService(
+            session, client, fetch_workers=1
+        ).ingest_block_range(100, 104, VHK)
+
+        assert result.blocks_skipped == 3
+        assert result.blocks_created == 2
+        assert client.calls == [103, 104]
+
+    def test_rejected_block_rows_are_recorded_not_fatal(self, session: Session) -> None:
+        IngestionService(session, _FakeChainClient(), fetch_workers=1).ingest_block_range(
+            102, 102, VHK
+        )
+
+        # Re-ingesting block 102 without skipping collides with its stored snapshot.
+        result: IngestionResult = IngestionService(
+            session, _FakeChainClient(), fetch_workers=1
+        ).ingest_block_range(100, 104, VHK, skip_existing=False)
+
+        assert result.blocks_created == 4
+        assert len(result.errors) == 1
+        assert result.errors[0].startswith("Block 102: insert failed: UNIQUE constraint failed")
+        assert result.completeness_summary["COMPLETE"] == 4
+        assert _count(session, BlockSnapshots) == 5
+
+        with pytest.raises(IngestionError, match="block 102"):
+            IngestionService(session, _FakeChainClient(), fetch_workers=1).ingest_block_range(
+                102, 102, VHK, skip_existing=False, fail_on_error=True
+            )
+
+    def test_pending_blocks_span_fetch_chunks(
+        self, session: Session, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("rakeback.services.ingestion._FETCH_CHUNK_SIZE", 3)
+        IngestionService(session, _FakeChainClient(), fetch_workers=1).ingest_block_range(
+            103, 104, VHK
+        )
+
+        client: _FakeChainClient = _FakeChainClient()
+        result: IngestionResult = IngestionService(
+            session, client, fetch_workers=1
+        ).ingest_block_range(100, 110, VHK)
+
+        assert result.blocks_skipped == 2
+        assert result.blocks_created == 9
+        assert client.calls == [100, 101, 102, *range(105, 111)]
+        assert _count(session, BlockSnapshots) == 11
+
+
+class TestIngestConversions:
+    def test_inserts_new_and_skips_known(self, session: Session) -> None:
+        client: _FakeChainClient = _FakeChainClient(
+            conversions=[_conversion(100, "0xaa"), _conversion(101, "0xbb")]
+        )
+        svc: IngestionService = IngestionService(session, client, fetch_workers=1)
+        first: IngestionResult = svc.ingest_conversions(100, 101)
+        assert first.blocks_created == 2
+
+        client.conversions += [_conversion(102, "0xcc"), _conversion(102, "0xcc")]
+        second: IngestionResult = svc.ingest_conversions(100, 102)
+
+        assert second.blocks_created == 1
+        assert second.blocks_skipped == 3
+        assert second.errors == []
+        assert _count(session, ConversionEvents) == 3
+
+
+class TestCsvImports:
+    def test_snapshot_csv_replaces_blocks(self, session: Session, tmp_path: Path) -> None:
+        IngestionService(session, _FakeChainClient(), fetch_workers=1).ingest_block_range(
+            100, 100, VHK
+        )
+        csv_path: Path = tmp_path / "snapshots.csv"
+        csv_path.write_text(
+            "block_number,block_hash,timestamp,delegator_address,delegation_type,"
+            "subnet_id,balance_dtao,balance_tao\n"
+            "100,0xabc,2026-01-15T00:00:00,5A,subnet_dtao,1,30,\n"
+            "101,0xdef,2026-01-15T00:00:12,5A,subnet_dtao,1,10,\n"
+            "100,0xabc,2026-01-15T00:00:00,5B,root_tao,,70,7\n"
+            "bad,0x,2026-01-15T00:00:00,5C,subnet_dtao,1,1,\n"
+            "101,0xdef,2026-01-15T00:00:12,5D,subnet_dtao,1,n/a,\n"
+            "101,0xdef\n",
+            encoding="utf-8",
+        )
+        svc: IngestionService = IngestionService(session, _FakeChainClient(), fetch_workers=1)
+        result: IngestionResult = svc.import_snapshot_csv(csv_path, VHK)
+
+        assert result.blocks_created == 2
+        assert [e.split(":")[0] for e in result.errors] == ["Row 5", "Row 6", "Row 7"]
+        assert _count(session, BlockSnapshots) == 2
+        snap: BlockSnapshots | None = session.get(BlockSnapshots, (100, VHK))
+        assert snap is not None
+        assert snap.block_hash == "0xabc"
+        assert snap.total_stake == Decimal("100")
+        proportions: dict[str, Decimal] = {
+            d.delegator_address: d.proportion
+            for d in session.scalars(
+                select(DelegationEntries).where(DelegationEntries.block_number == 100)
+            )
+        }
+        assert proportions == {"5A": Decimal("0.3"), "5B": Decimal("0.7")}
+
+    def test_yield_csv_replaces_blocks(self, session: Session, tmp_path: Path) -> None:
+        csv_path: Path = tmp_path / "yields.csv"
+        csv_path.write_text(
+            "block_number,total_dtao_earned,subnet_id,subnet_dtao\n100,5,1,3\n100,5,2,2\n101,1,,\n",
+            encoding="utf-8",
+        )
+        svc: IngestionService = IngestionService(session, _FakeChainClient(), fetch_workers=1)
+        svc.import_yield_csv(csv_path, VHK)
+        result: IngestionResult = svc.import_yield_csv(csv_path, VHK)
+
+        assert result.blocks_created == 2
+        assert result.errors == []
+        assert _count(session, BlockYields) == 2
+        assert _count(session, YieldSources) == 2
+
+    def test_missing_required_columns_are_named(self, session: Session, tmp_path: Path) -> None:
+        csv_path: Path = tmp_path / "yields.csv"
+        csv_path.write_text("block,subnet_id\n100,1\n", encoding="utf-8")
+        svc: IngestionService = IngestionService(session, _FakeChainClient(), fetch_workers=1)
+        result: IngestionResult = svc.import_yield_csv(csv_path, VHK)
+
+        assert result.blocks_created == 0
+        assert result.errors == ["CSV is missing required columns: block_number, total_dtao_earned"]
+        run: ProcessingRuns | None = session.get(ProcessingRuns, result.run_id)
+        assert run is not None
+        assert run.status == RunStatus.FAILED.value
+
+
+def test_merge_intervals() -> None:
+    assert _merge_intervals([(10, 12), (1, 3), (4, 5), (11, 15), (20, 20)]) == [
+        (1, 5),
+        (10, 15),
+        (20, 20),
+    ]
+    assert _merge_intervals([]) == []
+
+
+def test_copy_buffer_marks_nulls() -> None:
+    rows: list[dict[str, object]] = [
+        {"id": "a", "subnet_id": None, "balance": Decimal("1.5"), "note": 'x, "y"'},
+        {"id": "b", "subnet_id": 3, "balance": Decimal("0"), "note": ""},
+    ]
+    buf: StringIO = _copy_buffer(rows, ["id", "subnet_id", "balance", "note"])
+    assert buf.read() == 'a,\\N,1.5,"x, ""y"""\nb,3,0,\n'
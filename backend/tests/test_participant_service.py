@@ -1,10 +1,14 @@
 """Tests for rakeback.services.participant_service."""
 
+import json
+
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 
 from app.schemas.partners import PartnerCreate, PartnerUpdate, RuleCreate
 from db.enums import ApiRuleType
-from rakeback.services._types import PartnerUI
+from db.models import RakebackParticipants
+from rakeback.services._types import PartnerUI, RuleUI
 from rakeback.services.participant_service import ParticipantService
 
 
@@ -84,6 +88,76 @@ class TestListPartners:
         result: list[PartnerUI] = svc.list_partners(active_only=False)
         assert len(result) == 2
 
+    def test_includes_each_partners_rules(self, session: Session) -> None:
+        svc: ParticipantService = ParticipantService(session)
+        svc.create_partner(
+            name="Wallet",
+            partner_type="named",
+            rakeback_rate=10.0,
+            rules=[RuleCreate(type=ApiRuleType.WALLET, config={"wallet": "5Wallet0000"})],
+        )
+        svc.create_partner(name="Bare", partner_type="named", rakeback_rate=20.0)
+        by_name: dict[str, PartnerUI] = {p["name"]: p for p in svc.list_partners()}
+        assert by_name["Wallet"]["walletAddress"] == "5Wallet0000"
+        assert len(by_name["Wallet"]["rules"]) == 1
+        assert by_name["Bare"]["rules"] == []
+
+    def test_does_not_load_matching_rules(self, session: Session) -> None:
+        svc: ParticipantService = ParticipantService(session)
+        svc.create_partner(name="P1", partner_type="named", rakeback_rate=10.0)
+        session.expunge_all()
+
+        loaded: list[RakebackParticipants] = svc._get_all_participants()
+        assert loaded and all("matching_rules" in inspect(p).unloaded for p in loaded)
+        assert json.loads(loaded[0].matching_rules) == {"rules": []}
+
+
+class TestPrimaryTag:
+    def test_first_wallet_or_memo_rule_wins(self, session: Session) -> None:
+        svc: ParticipantService = ParticipantService(session)
+        created: PartnerUI = svc.create_partner(
+            name="Tagged", partner_type="tag-based", rakeback_rate=10.0
+        )
+        assert created["walletAddress"] is None
+        assert created["memoTag"] is None
+
+        svc.add_rule(
+            created["id"], RuleCreate(type=ApiRuleType.MEMO, config={"memoString": "rt21"})
+        )
+        svc.add_rule(
+            created["id"], RuleCreate(type=ApiRuleType.WALLET, config={"wallet": "5Wallet0000"})
+        )
+        partner: PartnerUI | None = svc.get_partner(created["id"])
+        assert partner is not None
+        assert partner["memoTag"] == "rt21"
+        assert partner["walletAddress"] is None
+
+
+class TestAddRulesBulk:
+    def test_inserts_valid_rules(self, session: Session) -> None:
+        svc: ParticipantService = ParticipantService(session)
+        created: PartnerUI = svc.create_partner(name="Many", partner_type="named", rakeback_rate=5)
+        rules: list[RuleCreate] = [
+            RuleCreate(type=ApiRuleType.WALLET, config={"wallet": f"5Wallet{i:04d}"})
+            for i in range(50)
+        ]
+        rules.append(RuleCreate(type=ApiRuleType.WALLET, config={}))
+
+        added: list[RuleUI] | None = svc.add_rules_bulk(created["id"], rules)
+
+        assert added is not None and len(added) == 50
+        partner: PartnerUI | None = svc.get_partner(created["id"])
+        assert partner is not None
+        assert len(partner["rules"]) == 50
+        assert partner["walletAddress"] == "5Wallet0000"
+        assert svc.add_rules_bulk("nope", rules) is None
+
+        svc.add_rule(created["id"], RuleCreate(type=ApiRuleType.MEMO, config={"memoString": "x"}))
+        participant: RakebackParticipants | None = session.get(RakebackParticipants, created["id"])
+        assert participant is not None
+        stored: list[dict[str, object]] = json.loads(participant.matching_rules)["rules"]
+        assert [r["type"] for r in stored] == ["EXACT_ADDRESS"] * 50 + ["RT21_AUTO_DELEGATION"]
+
 
 class TestCreatePartnerFromRequest:
     def test_wallet_partner(self, session: Session) -> None:
@@ -1,20 +1,17 @@
 """Tests for all API routes via FastAPI TestClient."""
 
+import secrets
 from collections.abc import Generator
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session
 
 from app.routes import attributions, conversions, exports, partners, rakeback
 from db.connection import get_db
 from db.enums import CompletenessFlag, PaymentStatus, PeriodType
 from db.models import (
-    Base,
     BlockAttributions,
     ConversionEvents,
     RakebackLedgerEntries,
@@ -42,52 +39,32 @@ def _create_test_app() -> FastAPI:
 
 _test_app: FastAPI = _create_test_app()
 
+# Write routes take an API key header; auth is disabled when no key is configured.
+AUTH_HEADERS: dict[str, str] = {"X-API-Key": ""}
 
-@pytest.fixture()
-def _route_engine() -> Generator[Engine, None, None]:
-    """In-memory SQLite engine with check_same_thread=False for TestClient."""
-    eng: Engine = create_engine(
-        "sqlite:///:memory:",
-        echo=False,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    Base.metadata.create_all(eng)
-    yield eng
-    eng.dispose()
 
-
-@pytest.fixture()
-def _route_session(_route_engine: Engine) -> Generator[Session, None, None]:
-    factory: sessionmaker[Session] = sessionmaker(
-        bind=_route_engine,
-        autocommit=False,
-        autoflush=False,
-        expire_on_commit=False,
-    )
-    sess: Session = factory()
-    yield sess
-    sess.rollback()
-    sess.close()
+@pytest.fixture(scope="module")
+def _test_client() -> Generator[TestClient, None, None]:
+    """One TestClient per module; entering it runs the app's startup once."""
+    with TestClient(_test_app, raise_server_exceptions=True) as c:
+        yield c
 
 
 @pytest.fixture()
-def client(_route_session: Session) -> Generator[TestClient, None, None]:
-    """TestClient with DB dependency overridden to use test session."""
+def client(_test_client: TestClient, session: Session) -> Generator[TestClient, None, None]:
+    """Shared TestClient with the DB dependency pointed at this test's session.
+
+    The conftest engine is created with check_same_thread=False and a
+    StaticPool, so route handlers running in TestClient's worker thread see
+    the same in-memory database and per-test transaction.
+    """
 
     def _override_db() -> Generator[Session, None, None]:
-        yield _route_session
+        yield session
 
     _test_app.dependency_overrides[get_db] = _override_db
-    with TestClient(_test_app, raise_server_exceptions=True) as c:
-        yield c
-    _test_app.dependency_overrides.clear()
-
-
-@pytest.fixture()
-def session(_route_session: Session) -> Session:
-    """Alias so seed helpers can use the same session as the client."""
-    return _route_session
+    yield _test_client
+    _test_app.dependency_overrides.pop(get_db, None)
 
 
 def _seed_partner(session: Session, name: str = "Test Partner", rate: float = 50.0) -> PartnerUI:
@@ -123,7 +100,6 @@ def _seed_ledger_entry(session: Session, **overrides: object) -> RakebackLedgerE
     defaults.update(overrides)
     entry: RakebackLedgerEntries = RakebackLedgerEntries(**defaults)
     session.add(entry)
-    session.flush()
     return entry
 
 
@@ -146,7 +122,6 @@ def _seed_attribution(session: Session, **overrides: object) -> BlockAttribution
     defaults.update(overrides)
     attr: BlockAttributions = BlockAttributions(**defaults)
     session.add(attr)
-    session.flush()
     return attr
 
 
@@ -154,7 +129,7 @@ def _seed_conversion(session: Session, **overrides: object) -> ConversionEvents:
     defaults: dict[str, object] = {
         "id": new_id(),
         "block_number": 1000,
-        "transaction_hash": "0x" + new_id()[:8],
+        "transaction_hash": f"0x{secrets.token_hex(32)}",
         "validator_hotkey": "5FHne...",
         "dtao_amount": 100.0,
         "tao_amount": 10.0,
@@ -166,7 +141,6 @@ def _seed_conversion(session: Session, **overrides: object) -> ConversionEvents:
     defaults.update(overrides)
     conv: ConversionEvents = ConversionEvents(**defaults)
     session.add(conv)
-    session.flush()
     return conv
 
 
@@ -222,7 +196,7 @@ class TestPartnerRoutes:
                 "rakebackRate": 20.0,
                 "payoutAddress": "5FHneW46xGXgs5mUiveU4sbTyGBzmstUPZHb",
             },
-            headers={"X-API-Key": ""},
+            headers=AUTH_HEADERS,
         )
         assert resp.status_code == 200
         assert resp.json()["name"] == "New Partner"
@@ -232,7 +206,7 @@ class TestPartnerRoutes:
         resp = client.put(
             "/api/partners/partner-updme",
             json={"name": "Updated"},
-            headers={"X-API-Key": ""},
+            headers=AUTH_HEADERS,
         )
         assert resp.status_code == 200
         assert resp.json()["name"] == "Updated"
@@ -241,7 +215,7 @@ class TestPartnerRoutes:
         resp = client.put(
             "/api/partners/nope",
             json={"name": "X"},
-            headers={"X-API-Key": ""},
+            headers=AUTH_HEADERS,
         )
         assert resp.status_code == 404
 
@@ -253,7 +227,7 @@ class TestPartnerRoutes:
                 "type": "wallet",
                 "config": {"wallet": "5FHneW46xGXgs5mUiveU4sbTyGBzmstUPZHb"},
             },
-            headers={"X-API-Key": ""},
+            headers=AUTH_HEADERS,
         )
         assert resp.status_code == 200
         assert resp.json()["type"] == "wallet"
@@ -262,7 +236,7 @@ class TestPartnerRoutes:
         resp = client.post(
             "/api/partners/nonexistent/rules",
             json={"type": "wallet", "config": {}},
-            headers={"X-API-Key": ""},
+            headers=AUTH_HEADERS,
         )
         assert resp.status_code == 404
 
@@ -281,20 +255,19 @@ class TestPartnerRoutes:
 
 
 class TestRakebackRoutes:
-    def test_list_empty(self, client: TestClient) -> None:
-        resp = client.get("/api/rakeback")
-        assert resp.status_code == 200
-        assert resp.json() == []
-
-    def test_list_with_entries(self, client: TestClient, session: Session) -> None:
-        _seed_ledger_entry(session)
+    @pytest.mark.parametrize("seeded", [False, True], ids=["empty", "with_entries"])
+    def test_list(self, client: TestClient, session: Session, seeded: bool) -> None:
+        if seeded:
+            _seed_ledger_entry(session)
+            session.flush()
         resp = client.get("/api/rakeback")
         assert resp.status_code == 200
-        assert len(resp.json()) == 1
+        assert len(resp.json()) == int(seeded)
 
     def test_filter_by_partner(self, client: TestClient, session: Session) -> None:
         _seed_ledger_entry(session, participant_id="partner-a")
         _seed_ledger_entry(session, participant_id="partner-b")
+        session.flush()
         resp = client.get("/api/rakeback", params={"partner_id": "partner-a"})
         assert resp.status_code == 200
         assert len(resp.json()) == 1
@@ -313,6 +286,7 @@ class TestRakebackRoutes:
             participant_id="partner-b",
             payment_status=PaymentStatus.PAID.value,
         )
+        session.flush()
         resp = client.get("/api/rakeback/summary")
         assert resp.status_code == 200
         data: dict[str, object] = resp.json()
@@ -325,16 +299,14 @@ class TestRakebackRoutes:
 
 
 class TestAttributionRoutes:
-    def test_list_empty(self, client: TestClient) -> None:
-        resp = client.get("/api/attributions", params={"start": 0, "end": 9999})
-        assert resp.status_code == 200
-        assert resp.json() == []
-
-    def test_list_with_data(self, client: TestClient, session: Session) -> None:
-        _seed_attribution(session)
+    @pytest.mark.parametrize("seeded", [False, True], ids=["empty", "with_data"])
+    def test_list(self, client: TestClient, session: Session, seeded: bool) -> None:
+        if seeded:
+            _seed_attribution(session)
+            session.flush()
         resp = client.get("/api/attributions", params={"start": 0, "end": 9999})
         assert resp.status_code == 200
-        assert len(resp.json()) == 1
+        assert len(resp.json()) == int(seeded)
 
     def test_stats_empty(self, client: TestClient) -> None:
         resp = client.get("/api/attributions/stats")
@@ -345,6 +317,7 @@ class TestAttributionRoutes:
     def test_stats_with_data(self, client: TestClient, session: Session) -> None:
         _seed_attribution(session, block_number=100)
         _seed_attribution(session, block_number=101, delegator_address="5Xyz...")
+        session.flush()
         resp = client.get(
             "/api/attributions/stats",
             params={"start": 100, "end": 101},
@@ -355,6 +328,7 @@ class TestAttributionRoutes:
 
     def test_block_detail(self, client: TestClient, session: Session) -> None:
         _seed_attribution(session, block_number=500)
+        session.flush()
         resp = client.get("/api/attributions/block/500")
         assert resp.status_code == 200
         data: dict[str, object] = resp.json()
@@ -372,19 +346,18 @@ class TestAttributionRoutes:
 
 
 class TestConversionRoutes:
-    def test_list_empty(self, client: TestClient) -> None:
-        resp = client.get("/api/conversions")
-        assert resp.status_code == 200
-        assert resp.json() == []
-
-    def test_list_with_data(self, client: TestClient, session: Session) -> None:
-        _seed_conversion(session)
+    @pytest.mark.parametrize("seeded", [False, True], ids=["empty", "with_data"])
+    def test_list(self, client: TestClient, session: Session, seeded: bool) -> None:
+        if seeded:
+            _seed_conversion(session)
+            session.flush()
         resp = client.get("/api/conversions")
         assert resp.status_code == 200
-        assert len(resp.json()) == 1
+        assert len(resp.json()) == int(seeded)
 
     def test_detail(self, client: TestClient, session: Session) -> None:
         conv: ConversionEvents = _seed_conversion(session)
+        session.flush()
         resp = client.get(f"/api/conversions/{conv.id}")
         assert resp.status_code == 200
         data: dict[str, object] = resp.json()
@@ -409,10 +382,11 @@ class TestExportRoutes:
 
     def test_download_json(self, client: TestClient, session: Session) -> None:
         _seed_ledger_entry(session)
+        session.flush()
         resp = client.get(
             "/api/exports/download",
             params={"format": "json"},
-            headers={"X-API-Key": ""},
+            headers=AUTH_HEADERS,
         )
         assert resp.status_code == 200
         data: dict[str, object] = resp.json()
@@ -421,10 +395,11 @@ class TestExportRoutes:
 
     def test_download_csv(self, client: TestClient, session: Session) -> None:
         _seed_ledger_entry(session)
+        session.flush()
         resp = client.get(
             "/api/exports/download",
             params={"format": "csv"},
-            headers={"X-API-Key": ""},
+            headers=AUTH_HEADERS,
         )
         assert resp.status_code == 200
         data: dict[str, object] = resp.json()
@@ -434,10 +409,11 @@ class TestExportRoutes:
     def test_download_filter_by_partner(self, client: TestClient, session: Session) -> None:
         _seed_ledger_entry(session, participant_id="partner-a")
         _seed_ledger_entry(session, participant_id="partner-b")
+        session.flush()
         resp = client.get(
             "/api/exports/download",
             params={"format": "json", "partner_id": "partner-a"},
-            headers={"X-API-Key": ""},
+            headers=AUTH_HEADERS,
         )
         assert resp.status_code == 200
         assert resp.json()["record_count"] == 1
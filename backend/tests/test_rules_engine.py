@@ -2,6 +2,7 @@
 
 from datetime import date
 
+import pytest
 from sqlalchemy.orm import Session
 
 from db.enums import DelegationType
@@ -10,14 +11,13 @@ from rakeback.services._helpers import dump_json, now_iso
 from rakeback.services.rules_engine import RulesEngine
 
 
-def _make_participant(
-    session: Session,
+def _participant(
     pid: str,
     rules: list[dict[str, object]],
     **kwargs: object,
 ) -> RakebackParticipants:
     ts: str = now_iso()
-    p: RakebackParticipants = RakebackParticipants(
+    return RakebackParticipants(
         id=pid,
         name=kwargs.get("name", pid),
         type=kwargs.get("type", "PARTNER"),
@@ -30,93 +30,111 @@ def _make_participant(
         created_at=ts,
         updated_at=ts,
     )
-    session.add(p)
+
+
+def _make_participants(
+    session: Session, participants: list[RakebackParticipants]
+) -> list[RakebackParticipants]:
+    """Add several participants and write them with one flush."""
+    session.add_all(participants)
     session.flush()
-    return p
+    return participants
+
+
+def _make_participant(
+    session: Session,
+    pid: str,
+    rules: list[dict[str, object]],
+    **kwargs: object,
+) -> RakebackParticipants:
+    return _make_participants(session, [_participant(pid, rules, **kwargs)])[0]
+
+
+@pytest.fixture()
+def rules_engine(session: Session) -> RulesEngine:
+    return RulesEngine(session)
 
 
 class TestMatchDelegator:
-    def test_exact_address_match(self, session: Session) -> None:
+    def test_exact_address_match(self, session: Session, rules_engine: RulesEngine) -> None:
         _make_participant(
             session,
             "p1",
             [{"type": "EXACT_ADDRESS", "addresses": ["5Abc123456"]}],
         )
-        engine: RulesEngine = RulesEngine(session)
-
-        result: RakebackParticipants | None = engine.match_delegator(
+        result: RakebackParticipants | None = rules_engine.match_delegator(
             "5Abc123456", DelegationType.ROOT_TAO, None, date(2025, 6, 1)
         )
         assert result is not None
         assert result.id == "p1"
 
-    def test_no_match(self, session: Session) -> None:
+    def test_no_match(self, session: Session, rules_engine: RulesEngine) -> None:
         _make_participant(
             session,
             "p1",
             [{"type": "EXACT_ADDRESS", "addresses": ["5Abc123456"]}],
         )
-        engine: RulesEngine = RulesEngine(session)
-
-        result: RakebackParticipants | None = engine.match_delegator(
+        result: RakebackParticipants | None = rules_engine.match_delegator(
             "5Xyz999999", DelegationType.ROOT_TAO, None, date(2025, 6, 1)
         )
         assert result is None
 
-    def test_all_rule_matches_everything(self, session: Session) -> None:
+    def test_all_rule_matches_everything(self, session: Session, rules_engine: RulesEngine) -> None:
         _make_participant(session, "catch-all", [{"type": "ALL"}])
-        engine: RulesEngine = RulesEngine(session)
-
-        result: RakebackParticipants | None = engine.match_delegator(
+        result: RakebackParticipants | None = rules_engine.match_delegator(
             "5AnyAddress", DelegationType.SUBNET_DTAO, 1, date(2025, 6, 1)
         )
         assert result is not None
 
-    def test_delegation_type_rule(self, session: Session) -> None:
+    def test_delegation_type_rule(self, session: Session, rules_engine: RulesEngine) -> None:
         _make_participant(
             session,
             "subnet-only",
             [{"type": "DELEGATION_TYPE", "delegation_types": ["SUBNET_DTAO"]}],
         )
-        engine: RulesEngine = RulesEngine(session)
-
-        matched: RakebackParticipants | None = engine.match_delegator(
+        matched: RakebackParticipants | None = rules_engine.match_delegator(
             "5Abc", DelegationType.SUBNET_DTAO, 1, date(2025, 6, 1)
         )
         assert matched is not None
 
-        not_matched: RakebackParticipants | None = engine.match_delegator(
+        not_matched: RakebackParticipants | None = rules_engine.match_delegator(
             "5Abc", DelegationType.ROOT_TAO, None, date(2025, 6, 1)
         )
         assert not_matched is None
 
-    def test_subnet_rule(self, session: Session) -> None:
+    def test_delegation_type_subnets_scoped_to_their_rule(
+        self, session: Session, rules_engine: RulesEngine
+    ) -> None:
         _make_participant(
             session,
-            "sn1-only",
-            [{"type": "SUBNET", "subnet_ids": [1, 2]}],
+            "mixed",
+            [
+                {"type": "DELEGATION_TYPE", "delegation_types": ["SUBNET_DTAO"], "subnet_ids": [1]},
+                {"type": "DELEGATION_TYPE", "delegation_types": ["ROOT_TAO"]},
+            ],
         )
-        engine: RulesEngine = RulesEngine(session)
+        assert rules_engine.match_delegator("5A", DelegationType.SUBNET_DTAO, 1) is not None
+        assert rules_engine.match_delegator("5A", DelegationType.SUBNET_DTAO, 2) is None
+        assert rules_engine.match_delegator("5A", DelegationType.ROOT_TAO, 2) is not None
 
-        assert engine.match_delegator("5A", DelegationType.SUBNET_DTAO, 1) is not None
-        assert engine.match_delegator("5A", DelegationType.SUBNET_DTAO, 99) is None
-
-    def test_priority_ordering(self, session: Session) -> None:
+    def test_subnet_rule(self, session: Session, rules_engine: RulesEngine) -> None:
         _make_participant(
             session,
-            "low-priority",
-            [{"type": "ALL"}],
-            priority=10,
+            "sn1-only",
+            [{"type": "SUBNET", "subnet_ids": [1, 2]}],
         )
-        _make_participant(
+        assert rules_engine.match_delegator("5A", DelegationType.SUBNET_DTAO, 1) is not None
+        assert rules_engine.match_delegator("5A", DelegationType.SUBNET_DTAO, 99) is None
+
+    def test_priority_ordering(self, session: Session, rules_engine: RulesEngine) -> None:
+        _make_participants(
             session,
-            "high-priority",
-            [{"type": "ALL"}],
-            priority=1,
+            [
+                _participant("low-priority", [{"type": "ALL"}], priority=10),
+                _participant("high-priority", [{"type": "ALL"}], priority=1),
+            ],
         )
-        engine: RulesEngine = RulesEngine(session)
-
-        result: RakebackParticipants | None = engine.match_delegator(
+        result: RakebackParticipants | None = rules_engine.match_delegator(
             "5A",
             DelegationType.ROOT_TAO,
             None,
@@ -124,7 +142,46 @@ class TestMatchDelegator:
         assert result is not None
         assert result.id == "high-priority"
 
-    def test_expired_participant_not_matched(self, session: Session) -> None:
+    def test_index_keeps_priority_across_rule_kinds(
+        self, session: Session, rules_engine: RulesEngine
+    ) -> None:
+        _make_participants(
+            session,
+            [
+                _participant("by-subnet", [{"type": "SUBNET", "subnet_ids": [1]}], priority=3),
+                _participant(
+                    "by-dtype",
+                    [{"type": "DELEGATION_TYPE", "delegation_types": ["SUBNET_DTAO"]}],
+                    priority=2,
+                ),
+                _participant(
+                    "by-address", [{"type": "EXACT_ADDRESS", "addresses": ["5A"]}], priority=4
+                ),
+            ],
+        )
+
+        def matched(address: str, dtype: DelegationType, subnet_id: int | None) -> str | None:
+            p: RakebackParticipants | None = rules_engine.match_delegator(address, dtype, subnet_id)
+            return p.id if p is not None else None
+
+        assert matched("5A", DelegationType.SUBNET_DTAO, 1) == "by-dtype"
+        assert matched("5A", DelegationType.ROOT_TAO, 1) == "by-subnet"
+        assert matched("5A", DelegationType.ROOT_TAO, None) == "by-address"
+        assert matched("5B", DelegationType.ROOT_TAO, None) is None
+
+    def test_invalidate_picks_up_new_participants(
+        self, session: Session, rules_engine: RulesEngine
+    ) -> None:
+        assert rules_engine.match_delegator("5A", DelegationType.ROOT_TAO, None) is None
+
+        _make_participant(session, "late", [{"type": "ALL"}])
+        assert rules_engine.match_delegator("5A", DelegationType.ROOT_TAO, None) is None
+        rules_engine.invalidate()
+        assert rules_engine.match_delegator("5A", DelegationType.ROOT_TAO, None) is not None
+
+    def test_expired_participant_not_matched(
+        self, session: Session, rules_engine: RulesEngine
+    ) -> None:
         _make_participant(
             session,
             "old",
@@ -132,9 +189,7 @@ class TestMatchDelegator:
             effective_from="2020-01-01",
             effective_to="2020-12-31",
         )
-        engine: RulesEngine = RulesEngine(session)
-
-        result: RakebackParticipants | None = engine.match_delegator(
+        result: RakebackParticipants | None = rules_engine.match_delegator(
             "5A",
             DelegationType.ROOT_TAO,
             None,
@@ -144,44 +199,37 @@ class TestMatchDelegator:
 
 
 class TestMatchAddresses:
-    def test_filters_addresses(self, session: Session) -> None:
+    def test_filters_addresses(self, session: Session, rules_engine: RulesEngine) -> None:
         p: RakebackParticipants = _make_participant(
             session,
             "p1",
             [{"type": "EXACT_ADDRESS", "addresses": ["addr1", "addr3"]}],
         )
-        engine: RulesEngine = RulesEngine(session)
-
-        matched: list[str] = engine.match_addresses(p, ["addr1", "addr2", "addr3", "addr4"])
+        matched: list[str] = rules_engine.match_addresses(p, ["addr1", "addr2", "addr3", "addr4"])
         assert matched == ["addr1", "addr3"]
 
-    def test_all_rule_returns_everything(self, session: Session) -> None:
+    def test_all_rule_returns_everything(self, session: Session, rules_engine: RulesEngine) -> None:
         p: RakebackParticipants = _make_participant(session, "p1", [{"type": "ALL"}])
-        engine: RulesEngine = RulesEngine(session)
-
-        matched: list[str] = engine.match_addresses(p, ["a", "b", "c"])
+        matched: list[str] = rules_engine.match_addresses(p, ["a", "b", "c"])
         assert matched == ["a", "b", "c"]
 
 
 class TestValidateRules:
-    def test_valid_exact_address(self, session: Session) -> None:
+    def test_valid_exact_address(self, session: Session, rules_engine: RulesEngine) -> None:
         p: RakebackParticipants = _make_participant(
             session,
             "p1",
             [{"type": "EXACT_ADDRESS", "addresses": ["5FHneW46xGXgs5mUiveU4sbTyGBzmstUPZHb"]}],
         )
-        engine: RulesEngine = RulesEngine(session)
-        assert engine.validate_rules(p) == []
+        assert rules_engine.validate_rules(p) == []
 
-    def test_empty_rules(self, session: Session) -> None:
+    def test_empty_rules(self, session: Session, rules_engine: RulesEngine) -> None:
         p: RakebackParticipants = _make_participant(session, "p1", [])
-        engine: RulesEngine = RulesEngine(session)
-        errors: list[str] = engine.validate_rules(p)
+        errors: list[str] = rules_engine.validate_rules(p)
         assert len(errors) == 1
         assert "No matching rules" in errors[0]
 
-    def test_unknown_rule_type(self, session: Session) -> None:
+    def test_unknown_rule_type(self, session: Session, rules_engine: RulesEngine) -> None:
         p: RakebackParticipants = _make_participant(session, "p1", [{"type": "BOGUS"}])
-        engine: RulesEngine = RulesEngine(session)
-        errors: list[str] = engine.validate_rules(p)
+        errors: list[str] = rules_engine.validate_rules(p)
         assert any("No matching rules" in e for e in errors)
@@ -0,0 +1,140 @@
+"""Tests for rakeback.services.tao_price_service."""
+
+import http.client
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from db.models import TaoPrices
+from rakeback.services.tao_price_service import TaoPriceService
+
+
+def _stub_api(monkeypatch: pytest.MonkeyPatch, svc: TaoPriceService, price: str) -> list[int]:
+    calls: list[int] = []
+
+    def fake_request() -> object:
+        calls.append(1)
+        return {"data": [{"price": price}]}
+
+    monkeypatch.setattr(svc, "_request_price_json", fake_request)
+    return calls
+
+
+def _stub_connection(
+    monkeypatch: pytest.MonkeyPatch,
+    outcomes: list[tuple[int, str | None] | Exception],
+) -> list[int]:
+    """Replace HTTPSConnection; each request takes the next (status, Location) or raises."""
+    opened: list[int] = []
+    pending: list[tuple[int, str | None] | Exception] = list(outcomes)
+
+    class _FakeConnection:
+        def __init__(self, host: str, timeout: int) -> None:
+            opened.append(1)
+            self._outcome: tuple[int, str | None] | Exception | None = None
+
+        def request(self, method: str, path: str, headers: dict[str, str]) -> None:
+            self._outcome = pending.pop(0)
+            if isinstance(self._outcome, Exception):
+                raise self._outcome
+
+        def getresponse(self) -> MagicMock:
+            assert isinstance(self._outcome, tuple)
+            status, location = self._outcome
+            resp: MagicMock = MagicMock(status=status)
+            resp.read.return_value = b'{"price": "400"}'
+            resp.getheader.return_value = location
+            return resp
+
+        def close(self) -> None:
+            pass
+
+    monkeypatch.setattr(
+        "rakeback.services.tao_price_service.http.client.HTTPSConnection", _FakeConnection
+    )
+    return opened
+
+
+class TestFetchAndStore:
+    def test_reuses_recent_price(self, session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+        svc: TaoPriceService = TaoPriceService(session)
+        calls: list[int] = _stub_api(monkeypatch, svc, "412.5")
+
+        assert svc.fetch_and_store(block_number=100) == Decimal("412.5")
+        assert svc.fetch_and_store(block_number=101) == Decimal("412.5")
+
+        assert len(calls) == 1
+        # The reused price was stored when fetched; no duplicate row is added.
+        assert session.scalar(select(func.count()).select_from(TaoPrices)) == 1
+
+    def test_refetches_without_interval(
+        self, session: Session, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        svc: TaoPriceService = TaoPriceService(session, min_fetch_interval=0)
+        calls: list[int] = _stub_api(monkeypatch, svc, "400")
+        svc.fetch_and_store()
+        svc.fetch_and_store()
+        assert len(calls) == 2
+
+    def test_follows_redirect(self, session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+        _stub_connection(monkeypatch, [(301, "/api/price/latest/v2")])
+        followed: list[str] = []
+
+        def fake_redirected(url: str, headers: dict[str, str]) -> object:
+            followed.append(url)
+            return {"data": [{"price": "401"}]}
+
+        svc: TaoPriceService = TaoPriceService(session)
+        monkeypatch.setattr(svc, "_request_redirected_json", fake_redirected)
+
+        assert svc.fetch_and_store() == Decimal("401")
+        assert followed == ["https://api.taostats.io/api/price/latest/v2"]
+
+    def test_redirect_without_location_fails(
+        self, session: Session, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        _stub_connection(monkeypatch, [(302, None)])
+        svc: TaoPriceService = TaoPriceService(session)
+        with pytest.raises(http.client.HTTPException, match="without a Location"):
+            svc._request_price_json()
+
+    def test_retries_only_stale_connections(
+        self, session: Session, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        svc: TaoPriceService = TaoPriceService(session)
+
+        opened: list[int] = _stub_connection(
+            monkeypatch, [http.client.RemoteDisconnected("closed"), (200, None)]
+        )
+        assert svc._request_price_json() == {"price": "400"}
+        assert len(opened) == 2
+
+        svc.close()
+        opened = _stub_connection(monkeypatch, [TimeoutError("timed out"), (200, None)])
+        with pytest.raises(TimeoutError):
+            svc._request_price_json()
+        assert len(opened) == 1
+
+    def test_unparseable_response(self, session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+        svc: TaoPriceService = TaoPriceService(session)
+        _stub_api(monkeypatch, svc, "0")
+        assert svc.fetch_and_store() is None
+
+
+class TestPriceLookups:
+    def test_block_lookup_refreshes_after_store(
+        self, session: Session, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        svc: TaoPriceService = TaoPriceService(session, min_fetch_interval=0)
+        assert svc.get_price_at_block(100) is None
+
+        _stub_api(monkeypatch, svc, "400")
+        svc.fetch_and_store(block_number=90)
+        assert svc.get_price_at_block(100) == Decimal("400")
+
+        _stub_api(monkeypatch, svc, "410")
+        svc.fetch_and_store(block_number=99)
+        assert svc.get_price_at_block(100) == Decimal("410")
@@ -4,6 +4,7 @@ Usage:
     python -m worker.export_ledger --period-type DAILY --start 2026-01-01 --end 2026-01-31
     python -m worker.export_ledger --period-type MONTHLY \
         --start 2026-01-01 --end 2026-01-31 -o report.csv
+    python -m worker.export_ledger -t DAILY -s 2026-01-01 -e 2026-01-31 --compress
 """
 
 import argparse
@@ -57,6 +58,11 @@ def main(argv: list[str] | None = None) -> None:
         default=True,
         help="Include entries with incomplete data (default: true)",
     )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Write gzip-compressed CSV (.csv.gz)",
+    )
     args: argparse.Namespace = parser.parse_args(argv)
 
     period_type: PeriodType = PeriodType(args.period_type)
@@ -76,6 +82,7 @@ def main(argv: list[str] | None = None) -> None:
             period_end=args.end,
             output_path=args.output,
             include_incomplete=args.include_incomplete,
+            compress=args.compress,
         )
 
     logger.info(
@@ -34,7 +34,10 @@ def main(argv: list[str] | None = None) -> None:
 
     with get_session() as session:
         service: TaoPriceService = TaoPriceService(session, api_key=api_key)
-        price: Decimal | None = service.fetch_and_store(block_number=args.block)
+        try:
+            price: Decimal | None = service.fetch_and_store(block_number=args.block)
+        finally:
+            service.close()
 
     if price is not None:
         logger.info("Stored TAO price", price_usd=str(price), block=args.block)
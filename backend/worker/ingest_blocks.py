@@ -3,10 +3,14 @@
 Usage:
     python -m worker.ingest_blocks --validator VHK --block-range 1000:2000
     python -m worker.ingest_blocks --validator VHK --block-range 1000:2000 --skip-existing
+    python -m worker.ingest_blocks --validator VHK --block-range 1000:2000 --fetch-workers 16
+    python -m worker.ingest_blocks --validator VHK --block-range 1000:900000 --batch-size 10000
 """
 
 import argparse
+import re
 import sys
+from collections.abc import Iterator
 
 import structlog
 
@@ -16,15 +20,25 @@ from rakeback.services.ingestion import IngestionResult, IngestionService
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger(__name__)
 
+_BLOCK_RANGE_RE: re.Pattern[str] = re.compile(r"(\d+):(\d+)")
+
+# Blocks per ingestion run; each batch is committed before the next starts.
+DEFAULT_BATCH_SIZE: int = 5000
+
 
 def parse_block_range(raw: str) -> tuple[int, int]:
-    try:
-        parts: list[str] = raw.split(":")
-        return int(parts[0]), int(parts[1])
-    except (ValueError, IndexError) as exc:
+    match: re.Match[str] | None = _BLOCK_RANGE_RE.fullmatch(raw)
+    if match is None:
         raise argparse.ArgumentTypeError(
             f"Invalid block range '{raw}'. Expected START:END (e.g. 1000:2000)"
-        ) from exc
+        )
+    return int(match[1]), int(match[2])
+
+
+def iter_batches(start_block: int, end_block: int, size: int) -> Iterator[tuple[int, int]]:
+    """Split the inclusive range START..END into inclusive sub-ranges of ``size`` blocks."""
+    for lo in range(start_block, end_block + 1, size):
+        yield lo, min(lo + size - 1, end_block)
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -51,6 +65,18 @@ def main(argv: list[str] | None = None) -> None:
         default=False,
         help="Abort on first block error",
     )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=None,
+        help="Concurrent chain RPC fetches (default: CHAIN_FETCH_WORKERS)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Blocks per committed ingestion run (default: {DEFAULT_BATCH_SIZE})",
+    )
     args: argparse.Namespace = parser.parse_args(argv)
     start_block: int
     end_block: int
@@ -63,33 +89,65 @@ def main(argv: list[str] | None = None) -> None:
         end=end_block,
     )
 
+    run_ids: list[str] = []
+    blocks_processed: int = 0
+    blocks_created: int = 0
+    blocks_skipped: int = 0
+    gaps: int = 0
+    errors: list[str] = []
+
     with get_session() as session:
         chain_client: ChainClient = ChainClient()
-        service: IngestionService = IngestionService(session, chain_client)
-
-        result: IngestionResult = service.ingest_block_range(
-            start_block=start_block,
-            end_block=end_block,
-            validator_hotkey=args.validator,
-            skip_existing=args.skip_existing,
-            fail_on_error=args.fail_on_error,
+        service: IngestionService = IngestionService(
+            session, chain_client, fetch_workers=args.fetch_workers
         )
 
+        try:
+            # Each batch is its own run and transaction: a failure part-way keeps
+            # the batches already committed, and the session never holds more than
+            # one batch of rows. A rerun skips the committed blocks.
+            for lo, hi in iter_batches(start_block, end_block, max(args.batch_size, 1)):
+                result: IngestionResult = service.ingest_block_range(
+                    start_block=lo,
+                    end_block=hi,
+                    validator_hotkey=args.validator,
+                    skip_existing=args.skip_existing,
+                    fail_on_error=args.fail_on_error,
+                )
+                session.commit()
+                session.expunge_all()
+
+                run_ids.append(result.run_id)
+                blocks_processed += result.blocks_processed
+                blocks_created += result.blocks_created
+                blocks_skipped += result.blocks_skipped
+                gaps += len(result.gaps_detected)
+                errors.extend(result.errors)
+                logger.info(
+                    "Ingested batch",
+                    run_id=result.run_id,
+                    start=lo,
+                    end=hi,
+                    blocks_created=result.blocks_created,
+                )
+        finally:
+            service.close()
+
     logger.info(
         "Ingestion complete",
-        run_id=result.run_id,
-        blocks_processed=result.blocks_processed,
-        blocks_created=result.blocks_created,
-        blocks_skipped=result.blocks_skipped,
-        gaps=len(result.gaps_detected),
-        errors=len(result.errors),
+        runs=len(run_ids),
+        blocks_processed=blocks_processed,
+        blocks_created=blocks_created,
+        blocks_skipped=blocks_skipped,
+        gaps=gaps,
+        errors=len(errors),
     )
 
-    if result.errors:
-        for err in result.errors[:10]:
+    if errors:
+        for err in errors[:10]:
             logger.error("ingestion_error", detail=err)
-        if len(result.errors) > 10:
-            logger.warning("truncated_errors", remaining=len(result.errors) - 10)
+        if len(errors) > 10:
+            logger.warning("truncated_errors", remaining=len(errors) - 10)
         sys.exit(1)
 
 
@@ -6,6 +6,7 @@ Usage:
 """
 
 import argparse
+import re
 from datetime import date
 
 import structlog
@@ -15,15 +16,14 @@ from rakeback.services.aggregation import AggregationResult, AggregationService
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger(__name__)
 
+_MONTH_RE: re.Pattern[str] = re.compile(r"(\d{4})-(0[1-9]|1[0-2])")
+
 
 def parse_month(raw: str) -> tuple[int, int]:
-    try:
-        parts: list[str] = raw.split("-")
-        return int(parts[0]), int(parts[1])
-    except (ValueError, IndexError) as exc:
-        raise argparse.ArgumentTypeError(
-            f"Invalid month '{raw}'. Expected YYYY-MM (e.g. 2026-01)"
-        ) from exc
+    match: re.Match[str] | None = _MONTH_RE.fullmatch(raw)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"Invalid month '{raw}'. Expected YYYY-MM (e.g. 2026-01)")
+    return int(match[1]), int(match[2])
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -1,42 +1,141 @@
 """Worker: compute attributions for a block range.
 
 Usage:
+    python -m worker.run_attribution --validator VHK --start 1000 --end 2000
     python -m worker.run_attribution --validator VHK --block-range 1000:2000
     python -m worker.run_attribution --validator VHK --block-range 1000:2000 --dry-run
+    python -m worker.run_attribution --validator VHK --block-range 1000:900000 --chunk-size 2000
+    python -m worker.run_attribution --validator VHK --block-range 1000:900000 --workers 4
 """
 
 import argparse
+import re
 import sys
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from decimal import Decimal
+from itertools import islice
 
 import structlog
 
-from db.connection import get_session
-from rakeback.services.attribution import AttributionEngine, AttributionResult
+from rakeback.services.schemas import AttributionResult
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger(__name__)
 
+_BLOCK_RANGE_RE: re.Pattern[str] = re.compile(r"(\d+):(\d+)")
+
+# Blocks per attribution run; each chunk is committed before the next starts.
+DEFAULT_CHUNK_SIZE: int = 1000
+
 
 def parse_block_range(raw: str) -> tuple[int, int]:
-    try:
-        parts: list[str] = raw.split(":")
-        return int(parts[0]), int(parts[1])
-    except (ValueError, IndexError) as exc:
+    match: re.Match[str] | None = _BLOCK_RANGE_RE.fullmatch(raw)
+    if match is None:
         raise argparse.ArgumentTypeError(
             f"Invalid block range '{raw}'. Expected START:END (e.g. 1000:2000)"
-        ) from exc
+        )
+    return int(match[1]), int(match[2])
+
+
+def iter_chunks(start_block: int, end_block: int, size: int) -> Iterator[tuple[int, int]]:
+    """Split the inclusive range START..END into inclusive sub-ranges of ``size`` blocks."""
+    for lo in range(start_block, end_block + 1, size):
+        yield lo, min(lo + size - 1, end_block)
+
+
+def iter_shards(start_block: int, end_block: int, count: int) -> Iterator[tuple[int, int]]:
+    """Split the inclusive range START..END into ``count`` contiguous, near-equal sub-ranges."""
+    total: int = end_block - start_block + 1
+    base: int
+    extra: int
+    base, extra = divmod(total, count)
+    lo: int = start_block
+    for i in range(min(count, total)):
+        hi: int = lo + base + (1 if i < extra else 0) - 1
+        yield lo, hi
+        lo = hi + 1
+
+
+def merge_results(results: list[AttributionResult]) -> AttributionResult:
+    """Fold per-chunk results, given in block order, into one; the run_id is the first chunk's."""
+    completeness: Counter[str] = Counter()
+    for r in results:
+        completeness.update(r.completeness_summary)
+    return AttributionResult(
+        run_id=results[0].run_id if results else "",
+        blocks_processed=sum(r.blocks_processed for r in results),
+        attributions_created=sum(r.attributions_created for r in results),
+        blocks_skipped=sum(r.blocks_skipped for r in results),
+        blocks_incomplete=sum(r.blocks_incomplete for r in results),
+        total_dtao_attributed=sum((r.total_dtao_attributed for r in results), Decimal(0)),
+        completeness_summary=dict(completeness),
+        errors=[err for r in results for err in r.errors],
+    )
+
+
+def _run_shard(
+    validator: str,
+    start_block: int,
+    end_block: int,
+    skip_existing: bool,
+    dry_run: bool,
+    chunk_size: int,
+) -> list[AttributionResult]:
+    """Attribute START..END chunk by chunk; module-level so worker processes can pickle it."""
+    # One run and one transaction per chunk: commit overhead is paid once per
+    # chunk rather than per block, and the session never holds more than one
+    # chunk of rows. Chunks are disjoint, so skip_existing only ever sees blocks
+    # from earlier, already committed chunks. Gap consolidation scans every open
+    # gap of the validator, so it is left to a single pass after all chunks.
+    from db.connection import get_session
+    from rakeback.services.attribution import AttributionEngine
+
+    results: list[AttributionResult] = []
+    for lo, hi in iter_chunks(start_block, end_block, chunk_size):
+        with get_session() as session:
+            chunk: AttributionResult = AttributionEngine(session).run_attribution(
+                start_block=lo,
+                end_block=hi,
+                validator_hotkey=validator,
+                skip_existing=skip_existing,
+                dry_run=dry_run,
+                consolidate_gaps=False,
+            )
+        results.append(chunk)
+        logger.info(
+            "Attributed chunk",
+            run_id=chunk.run_id,
+            start=lo,
+            end=hi,
+            attributions_created=chunk.attributions_created,
+        )
+    return results
+
+
+def _consolidate_gaps(validator: str) -> None:
+    """Merge the validator's overlapping open gaps once, after every chunk has committed."""
+    from db.connection import get_session
+    from rakeback.services.attribution import AttributionEngine
+
+    with get_session() as session:
+        AttributionEngine(session).consolidate_gaps(validator)
 
 
 def main(argv: list[str] | None = None) -> None:
+    # The engine and service modules (SQLAlchemy, models) are imported where they
+    # are used, so --help and argument errors return without loading them.
     parser: argparse.ArgumentParser = argparse.ArgumentParser(
         description="Run attribution for a block range",
     )
     parser.add_argument("--validator", "-v", required=True, help="Validator hotkey")
+    parser.add_argument("--start", type=int, help="First block of the range (inclusive)")
+    parser.add_argument("--end", type=int, help="Last block of the range (inclusive)")
     parser.add_argument(
         "--block-range",
         "-b",
-        required=True,
         type=parse_block_range,
-        help="Block range START:END (e.g. 1000:2000)",
+        help="Block range START:END (e.g. 1000:2000); alternative to --start/--end",
     )
     parser.add_argument(
         "--skip-existing",
@@ -50,33 +149,88 @@ def main(argv: list[str] | None = None) -> None:
         default=False,
         help="Compute without persisting",
     )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Blocks per committed attribution run (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Processes attributing disjoint shards of the range in parallel; "
+            "PostgreSQL only (default: 1)"
+        ),
+    )
     args: argparse.Namespace = parser.parse_args(argv)
     start_block: int
     end_block: int
-    start_block, end_block = args.block_range
+    if args.block_range is not None:
+        if args.start is not None or args.end is not None:
+            parser.error("--block-range cannot be combined with --start/--end")
+        start_block, end_block = args.block_range
+    elif args.start is None or args.end is None:
+        parser.error("either --block-range or both --start and --end are required")
+    else:
+        start_block, end_block = args.start, args.end
+    if start_block < 0:
+        parser.error("start must be >= 0")
+    if start_block > end_block:
+        parser.error("start must be <= end")
+    chunk_size: int = max(args.chunk_size, 1)
+    workers: int = max(args.workers, 1)
+    if workers > 1:
+        from config import get_settings
+
+        # SQLite allows one writer at a time, so shards would only queue on its
+        # lock (and can outlast busy_timeout) rather than run in parallel.
+        if not get_settings().database._use_postgres():
+            parser.error("--workers > 1 requires PostgreSQL (DATABASE_URL)")
+    # Logged instead of the full hotkey.
+    validator_short: str = args.validator[:16]
 
     logger.info(
         "Starting attribution",
-        validator=args.validator[:16],
+        validator=validator_short,
         start=start_block,
         end=end_block,
         dry_run=args.dry_run,
+        workers=args.workers,
     )
 
-    with get_session() as session:
-        service: AttributionEngine = AttributionEngine(session)
-
-        result: AttributionResult = service.run_attribution(
-            start_block=start_block,
-            end_block=end_block,
-            validator_hotkey=args.validator,
-            skip_existing=args.skip_existing,
-            dry_run=args.dry_run,
+    chunk_results: list[AttributionResult] = []
+    if workers == 1:
+        chunk_results = _run_shard(
+            args.validator, start_block, end_block, args.skip_existing, args.dry_run, chunk_size
         )
+    else:
+        # Blocks are attributed independently and gaps are only consolidated
+        # after the pool finishes, so disjoint shards need no coordination. Each
+        # process opens its own engine and sessions; the parent has not touched
+        # the database yet, so nothing is shared on fork.
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures: list[Future[list[AttributionResult]]] = [
+                pool.submit(
+                    _run_shard, args.validator, lo, hi, args.skip_existing, args.dry_run, chunk_size
+                )
+                for lo, hi in iter_shards(start_block, end_block, workers)
+            ]
+            # Collected in submission order so chunk_results stays in block order.
+            for future in futures:
+                chunk_results.extend(future.result())
+
+    if not args.dry_run:
+        _consolidate_gaps(args.validator)
+
+    result: AttributionResult = merge_results(chunk_results)
 
     logger.info(
         "Attribution complete",
-        run_id=result.run_id,
+        validator=validator_short,
+        first_run_id=result.run_id,
+        runs=len(chunk_results),
         blocks_processed=result.blocks_processed,
         attributions_created=result.attributions_created,
         blocks_skipped=result.blocks_skipped,
@@ -85,8 +239,13 @@ def main(argv: list[str] | None = None) -> None:
     )
 
     if result.errors:
-        for err in result.errors[:10]:
-            logger.error("attribution_error", detail=err)
+        logger.error(
+            "attribution_errors",
+            validator=validator_short,
+            count=len(result.errors),
+            sample=list(islice(result.errors, 10)),
+            truncated=len(result.errors) > 10,
+        )
         sys.exit(1)
 
 